@@ -4,10 +4,15 @@ Personal Trading Dashboard for Forex Bot
 import sys
 import os
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Blueprint, render_template, jsonify, request
 from flask_cors import CORS
+from waitress import serve
 from datetime import datetime
+from collections import deque
+from itertools import islice
+from types import SimpleNamespace
 import threading
+import time
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
@@ -16,22 +21,28 @@ from src import (
     get_config,
     OandaClient,
     RiskManager,
+    default_state_path,
     TradeExecutor,
     TradingViewWebhook,
     setup_logger,
-    get_instrument_manager
+    get_instrument_manager,
+    OrjsonProvider
 )
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
-# Global bot instance
-bot = None
+# Shared stand-in for a missing long/short side of a position
+_EMPTY = {}
 
 
 class TradingBotDashboard:
     """Trading bot with dashboard interface."""
 
+    # Seconds an OANDA account snapshot is reused across dashboard polls
+    SNAPSHOT_TTL = 1.0
+
     def __init__(self, config_path: str = None):
         """Initialize the trading bot and dashboard."""
         # Load configuration
@@ -47,12 +58,23 @@ class TradingBotDashboard:
 
         self.logger.info("Trading Bot Dashboard Starting...")
 
+        # Short-lived cache of the last account snapshot
+        self._snapshot_lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_time = 0.0
+
         # Initialize components
         self._init_components()
 
-        # Trade history
-        self.trade_history = []
-        self.recent_signals = []
+        # Trade history (newest first, bounded). Webhook threads append while
+        # dashboard polls iterate, so both sides hold the lock.
+        self.trade_history = deque(maxlen=200)
+        self.recent_signals = deque(maxlen=20)
+        self._history_lock = threading.Lock()
+
+        # Dashboard routes, bound to this instance
+        self.blueprint = Blueprint('dashboard', __name__)
+        self._register_routes()
 
     def _init_components(self):
         """Initialize all bot components."""
@@ -71,35 +93,113 @@ class TradingBotDashboard:
 
         # Initialize other components
         self.instrument_manager = get_instrument_manager()
-        self.risk_manager = RiskManager(self.config.config)
+
+        # Stream prices for the configured instruments; get_current_price
+        # falls back to REST whenever the stream is down
+        stream_instruments = oanda_config.get('stream_instruments') or []
+        if stream_instruments:
+            self.oanda_client.start_pricing_stream(
+                [self.instrument_manager.normalize_symbol(s) for s in stream_instruments]
+            )
+        self.risk_manager = RiskManager(self.config.config, state_path=default_state_path())
         self.trade_executor = TradeExecutor(
             oanda_client=self.oanda_client,
             risk_manager=self.risk_manager,
             instrument_manager=self.instrument_manager
         )
 
-        # Initialize webhook if enabled
+        # Initialize webhook if enabled (served by the dashboard app at /webhook)
         tv_config = self.config.get('tradingview', {})
         if tv_config.get('enabled', True):
             self.webhook = TradingViewWebhook(
                 port=tv_config.get('webhook_port', 5000),
                 webhook_secret=tv_config.get('webhook_secret'),
-                allowed_ips=tv_config.get('allowed_ips', [])
+                allowed_ips=tv_config.get('allowed_ips', []),
+                require_signature_header=tv_config.get('require_signature_header', False),
+                mac_algorithm=tv_config.get('mac_algorithm', 'sha256')
             )
             self.webhook.register_signal_handler(self._handle_trading_signal)
-            # Start webhook in background
-            threading.Thread(target=self.webhook.run, daemon=True).start()
-            self.logger.info("TradingView webhook started")
+            self.logger.info("TradingView webhook enabled")
+        else:
+            self.webhook = None
+
+        self._snapshot_config()
+
+    def _snapshot_config(self):
+        """
+        Copy config values used by request handlers into plain attributes.
+
+        Call again after reloading the configuration.
+        """
+        oanda_config = self.config.get('oanda', {}) or {}
+        trading_config = self.config.get('trading', {}) or {}
+        self._cfg = SimpleNamespace(
+            environment=oanda_config.get('environment', 'practice'),
+            max_positions=trading_config.get('max_positions', 5),
+            risk_per_trade=trading_config.get('risk_per_trade', 0.02)
+        )
+
+    def _register_routes(self):
+        """Register dashboard routes on the blueprint."""
+
+        @self.blueprint.route('/')
+        def index():
+            """Main dashboard page."""
+            return render_template('dashboard.html')
+
+        @self.blueprint.route('/api/dashboard')
+        def dashboard_data():
+            """Get dashboard data API."""
+            return jsonify(self.get_dashboard_data())
+
+        @self.blueprint.route('/api/close-position', methods=['POST'])
+        def close_position():
+            """Close a position."""
+            data = request.get_json()
+            instrument = data.get('instrument')
+
+            if not instrument:
+                return jsonify({'error': 'Instrument required'}), 400
+
+            try:
+                result = self.trade_executor._execute_close({'instrument': instrument})
+                self.invalidate_snapshot()
+                return jsonify(result)
+            except Exception as e:
+                return jsonify({'error': str(e)}), 500
+
+        @self.blueprint.route('/api/enable-trading', methods=['POST'])
+        def enable_trading():
+            """Enable trading."""
+            self.risk_manager.enable_trading()
+            return jsonify({'status': 'success', 'trading_enabled': True})
+
+        @self.blueprint.route('/api/disable-trading', methods=['POST'])
+        def disable_trading():
+            """Disable trading."""
+            self.risk_manager.disable_trading()
+            return jsonify({'status': 'success', 'trading_enabled': False})
+
+        @self.blueprint.route('/api/manual-trade', methods=['POST'])
+        def manual_trade():
+            """Execute a manual trade."""
+            data = request.get_json()
+            try:
+                result = self.trade_executor.execute_signal(data)
+                self.invalidate_snapshot()
+                return jsonify(result)
+            except Exception as e:
+                return jsonify({'error': str(e)}), 500
 
     def _handle_trading_signal(self, signal: dict) -> dict:
         """Handle incoming trading signals."""
         self.logger.info(f"Processing signal: {signal['action']} {signal['instrument']}")
 
-        # Add to recent signals
-        signal['timestamp'] = datetime.now().isoformat()
-        self.recent_signals.insert(0, signal)
-        if len(self.recent_signals) > 20:
-            self.recent_signals.pop()
+        # Add to recent signals (one clock read shared with the trade record)
+        timestamp = datetime.now().isoformat()
+        signal['timestamp'] = timestamp
+        with self._history_lock:
+            self.recent_signals.appendleft(signal)
 
         try:
             result = self.trade_executor.execute_signal(signal)
@@ -107,7 +207,7 @@ class TradingBotDashboard:
             # Add to trade history
             if result['status'] == 'success':
                 trade_record = {
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': timestamp,
                     'action': result['action'],
                     'instrument': result['instrument'],
                     'units': result.get('units'),
@@ -116,65 +216,102 @@ class TradingBotDashboard:
                     'take_profit': result.get('take_profit'),
                     'status': 'open'
                 }
-                self.trade_history.insert(0, trade_record)
+                with self._history_lock:
+                    self.trade_history.appendleft(trade_record)
+                self.invalidate_snapshot()
 
             return result
         except Exception as e:
-            self.logger.error(f"Error handling signal: {e}", exc_info=True)
+            self.logger.exception("Error handling signal: %r", e)
             return {'status': 'error', 'message': str(e)}
 
+    def _get_account_snapshot(self):
+        """
+        Get account summary, positions and open trades from OANDA.
+
+        All three come from a single account details request. Results are
+        reused for SNAPSHOT_TTL seconds so concurrent or rapid polls share
+        one OANDA round-trip.
+
+        Returns:
+            Tuple of (account_summary, positions, open_trades)
+        """
+        with self._snapshot_lock:
+            now = time.monotonic()
+            if self._snapshot is not None and now - self._snapshot_time < self.SNAPSHOT_TTL:
+                return self._snapshot
+
+            account = self.oanda_client.get_account_details()
+            self._snapshot = (
+                account,
+                account.get('positions', []),
+                account.get('trades', [])
+            )
+            self._snapshot_time = now
+            return self._snapshot
+
+    def invalidate_snapshot(self):
+        """Drop the cached account snapshot so the next poll sees fresh state."""
+        self._snapshot = None
+
     def get_dashboard_data(self):
         """Get all dashboard data."""
+        timestamp = datetime.now().isoformat()
         try:
+            account_summary, positions, open_trades = self._get_account_snapshot()
+
             # Account info
-            account_summary = self.oanda_client.get_account_summary()
-            balance = float(account_summary.get('balance', 0))
+            balance = account_summary.get('balance', 0.0)
 
             # Positions
-            positions = self.oanda_client.get_current_positions()
             open_positions = []
             total_unrealized_pl = 0
 
             for pos in positions:
-                long_units = float(pos.get('long', {}).get('units', 0))
-                short_units = float(pos.get('short', {}).get('units', 0))
-                long_pl = float(pos.get('long', {}).get('unrealizedPL', 0))
-                short_pl = float(pos.get('short', {}).get('unrealizedPL', 0))
+                instrument = pos['instrument']
+                long_side = pos.get('long') or _EMPTY
+                short_side = pos.get('short') or _EMPTY
+                long_units = long_side.get('units', 0.0)
+                short_units = short_side.get('units', 0.0)
 
                 if long_units != 0:
+                    long_pl = long_side.get('unrealizedPL', 0.0)
                     open_positions.append({
-                        'instrument': pos['instrument'],
+                        'instrument': instrument,
                         'side': 'LONG',
                         'units': long_units,
                         'pl': long_pl,
-                        'avg_price': float(pos.get('long', {}).get('averagePrice', 0))
+                        'avg_price': long_side.get('averagePrice', 0.0)
                     })
                     total_unrealized_pl += long_pl
 
                 if short_units != 0:
+                    short_pl = short_side.get('unrealizedPL', 0.0)
                     open_positions.append({
-                        'instrument': pos['instrument'],
+                        'instrument': instrument,
                         'side': 'SHORT',
                         'units': abs(short_units),
                         'pl': short_pl,
-                        'avg_price': float(pos.get('short', {}).get('averagePrice', 0))
+                        'avg_price': short_side.get('averagePrice', 0.0)
                     })
                     total_unrealized_pl += short_pl
 
             # Risk status
             risk_status = self.risk_manager.get_risk_status(balance)
 
-            # Open trades
-            open_trades = self.oanda_client.get_open_trades()
+            # Snapshot the newest signals and trades
+            with self._history_lock:
+                recent_signals = list(islice(self.recent_signals, 10))
+                trade_history = list(islice(self.trade_history, 10))
 
             return {
                 'account': {
                     'balance': balance,
-                    'nav': float(account_summary.get('NAV', 0)),
+                    'nav': account_summary.get('NAV', 0.0),
                     'unrealized_pl': total_unrealized_pl,
-                    'margin_used': float(account_summary.get('marginUsed', 0)),
-                    'margin_available': float(account_summary.get('marginAvailable', 0)),
-                    'environment': self.config.get('oanda', {}).get('environment', 'practice')
+                    'margin_used': account_summary.get('marginUsed', 0.0),
+                    'margin_available': account_summary.get('marginAvailable', 0.0),
+                    'environment': self._cfg.environment
                 },
                 'positions': open_positions,
                 'risk': {
@@ -185,87 +322,20 @@ class TradingBotDashboard:
                     'weekly_loss_percent': risk_status['weekly_loss_percent'] * 100,
                     'daily_limit': risk_status['daily_limit'] * 100,
                     'weekly_limit': risk_status['weekly_limit'] * 100,
-                    'max_positions': self.config.get('trading', {}).get('max_positions', 5),
+                    'max_positions': self._cfg.max_positions,
                     'current_positions': len(open_positions),
-                    'risk_per_trade': self.config.get('trading', {}).get('risk_per_trade', 0.02) * 100
+                    'risk_per_trade': self._cfg.risk_per_trade * 100
                 },
-                'recent_signals': self.recent_signals[:10],
-                'trade_history': self.trade_history[:10],
+                'recent_signals': recent_signals,
+                'trade_history': trade_history,
                 'open_trades_count': len(open_trades),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
         except Exception as e:
             self.logger.error(f"Error getting dashboard data: {e}", exc_info=True)
             return {'error': str(e)}
 
 
-# Flask routes
-@app.route('/')
-def index():
-    """Main dashboard page."""
-    return render_template('dashboard.html')
-
-
-@app.route('/api/dashboard')
-def dashboard_data():
-    """Get dashboard data API."""
-    if bot:
-        data = bot.get_dashboard_data()
-        return jsonify(data)
-    return jsonify({'error': 'Bot not initialized'}), 500
-
-
-@app.route('/api/close-position', methods=['POST'])
-def close_position():
-    """Close a position."""
-    if not bot:
-        return jsonify({'error': 'Bot not initialized'}), 500
-
-    data = request.get_json()
-    instrument = data.get('instrument')
-
-    if not instrument:
-        return jsonify({'error': 'Instrument required'}), 400
-
-    try:
-        result = bot.trade_executor._execute_close({'instrument': instrument})
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/api/enable-trading', methods=['POST'])
-def enable_trading():
-    """Enable trading."""
-    if bot:
-        bot.risk_manager.enable_trading()
-        return jsonify({'status': 'success', 'trading_enabled': True})
-    return jsonify({'error': 'Bot not initialized'}), 500
-
-
-@app.route('/api/disable-trading', methods=['POST'])
-def disable_trading():
-    """Disable trading."""
-    if bot:
-        bot.risk_manager.disable_trading()
-        return jsonify({'status': 'success', 'trading_enabled': False})
-    return jsonify({'error': 'Bot not initialized'}), 500
-
-
-@app.route('/api/manual-trade', methods=['POST'])
-def manual_trade():
-    """Execute a manual trade."""
-    if not bot:
-        return jsonify({'error': 'Bot not initialized'}), 500
-
-    data = request.get_json()
-    try:
-        result = bot.trade_executor.execute_signal(data)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
 def main():
     """Main entry point."""
     import argparse
@@ -274,22 +344,30 @@ def main():
     parser.add_argument('--config', type=str, default=None, help='Path to configuration file')
     parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8080)), help='Dashboard port (default: 8080)')
     parser.add_argument('--host', type=str, default='127.0.0.1', help='Dashboard host (default: 127.0.0.1)')
+    parser.add_argument('--threads', type=int, default=8, help='Server worker threads (default: 8)')
 
     args = parser.parse_args()
 
-    # Initialize bot
-    global bot
+    # Initialize bot and mount its routes
     bot = TradingBotDashboard(config_path=args.config)
+    app.register_blueprint(bot.blueprint)
+
+    # Serve the TradingView webhook from the dashboard app
+    if bot.webhook:
+        app.register_blueprint(bot.webhook.blueprint)
 
     print("\n" + "=" * 60)
     print("FOREX TRADING BOT DASHBOARD")
     print("=" * 60)
     print(f"Dashboard URL: http://{args.host}:{args.port}")
-    print(f"Environment: {bot.config.get('oanda', {}).get('environment', 'practice').upper()}")
+    if bot.webhook:
+        print(f"Webhook URL:   http://{args.host}:{args.port}/webhook")
+    print(f"Environment: {bot._cfg.environment.upper()}")
     print("=" * 60 + "\n")
 
-    # Run Flask app
-    app.run(host=args.host, port=args.port, debug=False)
+    # Run Flask app on the waitress WSGI server, polling sockets with
+    # poll() rather than select()
+    serve(app, host=args.host, port=args.port, threads=args.threads, asyncore_use_poll=True)
 
 
 if __name__ == '__main__':
@@ -12,6 +12,7 @@ from src import (
     OandaClient,
     TradingViewWebhook,
     RiskManager,
+    default_state_path,
     TradeExecutor,
     setup_logger,
     get_instrument_manager
@@ -68,8 +69,16 @@ class ForexTradingBot:
         # Initialize instrument manager
         self.instrument_manager = get_instrument_manager()
 
+        # Stream prices for the configured instruments; get_current_price
+        # falls back to REST whenever the stream is down
+        stream_instruments = oanda_config.get('stream_instruments') or []
+        if stream_instruments:
+            self.oanda_client.start_pricing_stream(
+                [self.instrument_manager.normalize_symbol(s) for s in stream_instruments]
+            )
+
         # Initialize risk manager
-        self.risk_manager = RiskManager(self.config.config)
+        self.risk_manager = RiskManager(self.config.config, state_path=default_state_path())
 
         # Initialize trade executor
         self.trade_executor = TradeExecutor(
@@ -84,7 +93,10 @@ class ForexTradingBot:
             self.webhook = TradingViewWebhook(
                 port=tv_config.get('webhook_port', 5000),
                 webhook_secret=tv_config.get('webhook_secret'),
-                allowed_ips=tv_config.get('allowed_ips', [])
+                allowed_ips=tv_config.get('allowed_ips', []),
+                threads=tv_config.get('webhook_threads', 4),
+                require_signature_header=tv_config.get('require_signature_header', False),
+                mac_algorithm=tv_config.get('mac_algorithm', 'sha256')
             )
             # Register signal handler
             self.webhook.register_signal_handler(self._handle_trading_signal)
@@ -117,7 +129,7 @@ class ForexTradingBot:
             return result
 
         except Exception as e:
-            self.logger.error(f"Error handling signal: {e}", exc_info=True)
+            self.logger.exception("Error handling signal: %r", e)
             return {'status': 'error', 'message': str(e)}
 
     def get_account_info(self):
@@ -206,26 +218,37 @@ class ForexTradingBot:
             self.get_positions()
             self.get_risk_status()
 
-            # Start webhook server if enabled
+            # Start webhook server if enabled; the supervised background
+            # thread restarts it with backoff if it crashes
             if self.webhook:
                 self.logger.info("Starting TradingView webhook server...")
                 self.logger.info("Send trading signals to: http://your-server:5000/webhook")
-                self.webhook.run()
+                self.webhook.run_async()
             else:
                 self.logger.info("Running in manual mode (webhook disabled)")
                 self.logger.info("Press Ctrl+C to exit")
-                # Keep the bot running
-                import time
-                while True:
-                    time.sleep(60)
-                    # Optionally refresh account info periodically
-                    # self.get_account_info()
+
+            # Keep the bot running until SIGINT/SIGTERM
+            import signal
+            import threading
+            stop_event = threading.Event()
+            signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+            signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+            # Windows only delivers Ctrl+C between bytecodes, so an
+            # untimed wait would never return there
+            timeout = 1.0 if sys.platform == 'win32' else None
+            while not stop_event.wait(timeout):
+                pass
+            self.logger.info("\nShutting down trading bot...")
 
         except KeyboardInterrupt:
             self.logger.info("\nShutting down trading bot...")
         except Exception as e:
             self.logger.error(f"Error running bot: {e}", exc_info=True)
         finally:
+            if self.webhook:
+                self.webhook.shutdown()
             self.logger.info("Trading bot stopped")
 
 
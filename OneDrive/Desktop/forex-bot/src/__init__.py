@@ -2,12 +2,13 @@
 Forex Trading Bot Package
 """
 from .config_loader import ConfigLoader, get_config
-from .oanda_client import OandaClient
-from .tradingview_webhook import TradingViewWebhook
+from .oanda_client import OandaClient, OandaError, OandaErrorKind
+from .tradingview_webhook import TradingViewWebhook, TradingSignal
 from .instrument_manager import InstrumentManager, get_instrument_manager, AssetType
-from .risk_manager import RiskManager
+from .risk_manager import RiskManager, PositionSizing, RiskRejectReason, default_state_path
 from .trade_executor import TradeExecutor
 from .logger_config import setup_logger, get_logger
+from .json_provider import OrjsonProvider
 
 __version__ = '1.0.0'
 
@@ -15,12 +16,19 @@ __all__ = [
     'ConfigLoader',
     'get_config',
     'OandaClient',
+    'OandaError',
+    'OandaErrorKind',
     'TradingViewWebhook',
+    'TradingSignal',
     'InstrumentManager',
     'get_instrument_manager',
     'AssetType',
     'RiskManager',
+    'PositionSizing',
+    'RiskRejectReason',
+    'default_state_path',
     'TradeExecutor',
     'setup_logger',
     'get_logger',
+    'OrjsonProvider',
 ]
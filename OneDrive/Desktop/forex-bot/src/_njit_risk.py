@@ -0,0 +1,28 @@
+"""
+Batch position-size kernel, JIT-compiled with Numba when it is installed.
+"""
+import numpy as np
+
+from ._jit import njit
+
+
+@njit(cache=True)
+def _position_size_batch(balance, entry, stop_loss, min_size, max_size, risk_pct):
+    """
+    Vectorised form of RiskManager.calculate_position_size.
+
+    All arguments are float64 arrays of the same length.
+
+    Returns:
+        int64 array of position sizes in units
+    """
+    sl_distance = np.abs(entry - stop_loss)
+    zero_sl = sl_distance == 0
+    safe_distance = np.where(zero_sl, 1.0, sl_distance)
+
+    sizes = np.trunc(balance * risk_pct / safe_distance)
+    sizes = np.maximum(min_size, np.minimum(sizes, max_size))
+
+    # Matches the scalar path: a zero stop distance gives one unit, unclamped
+    sizes = np.where(zero_sl, 1.0, sizes)
+    return sizes.astype(np.int64)
@@ -3,14 +3,22 @@ Configuration loader for the forex trading bot.
 Loads settings from YAML config and environment variables.
 """
 import os
+import threading
 import yaml
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Mapping
 from pathlib import Path
 from dotenv import load_dotenv
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefer the LibYAML-backed loader; PyYAML falls back to pure Python without it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class ConfigLoader:
     """Loads and manages configuration settings."""
@@ -33,6 +41,7 @@ class ConfigLoader:
         self.config_path = Path(config_path)
         self.config = self._load_config()
         self._merge_env_variables()
+        self._finalize()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -42,8 +51,10 @@ class ConfigLoader:
             return self._get_default_config()
 
         try:
+            if not yaml.__with_libyaml__:
+                logger.warning("LibYAML not available, using the slower pure-Python YAML parser")
             with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YamlLoader)
                 logger.info(f"Configuration loaded from {self.config_path}")
                 return config or {}
         except Exception as e:
@@ -92,28 +103,60 @@ class ConfigLoader:
     def _merge_env_variables(self):
         """Override config with environment variables."""
         # OANDA configuration
-        if os.getenv('OANDA_ACCOUNT_ID'):
-            self.config.setdefault('oanda', {})
-            self.config['oanda']['account_id'] = os.getenv('OANDA_ACCOUNT_ID')
-
-        if os.getenv('OANDA_API_KEY'):
-            self.config.setdefault('oanda', {})
-            self.config['oanda']['api_key'] = os.getenv('OANDA_API_KEY')
-
-        if os.getenv('OANDA_ENVIRONMENT'):
-            self.config.setdefault('oanda', {})
-            env = os.getenv('OANDA_ENVIRONMENT')
-            self.config['oanda']['environment'] = env
+        oanda = self.config.setdefault('oanda', {})
+
+        account_id = os.getenv('OANDA_ACCOUNT_ID')
+        if account_id:
+            oanda['account_id'] = account_id
+
+        api_key = os.getenv('OANDA_API_KEY')
+        if api_key:
+            oanda['api_key'] = api_key
+
+        env = os.getenv('OANDA_ENVIRONMENT')
+        if env:
+            oanda['environment'] = env
             # Update base URL based on environment
             if env == 'live':
-                self.config['oanda']['base_url'] = 'https://api-fxtrade.oanda.com'
+                oanda['base_url'] = 'https://api-fxtrade.oanda.com'
             else:
-                self.config['oanda']['base_url'] = 'https://api-fxpractice.oanda.com'
+                oanda['base_url'] = 'https://api-fxpractice.oanda.com'
 
         # TradingView webhook secret
-        if os.getenv('TRADINGVIEW_WEBHOOK_SECRET'):
-            self.config.setdefault('tradingview', {})
-            self.config['tradingview']['webhook_secret'] = os.getenv('TRADINGVIEW_WEBHOOK_SECRET')
+        webhook_secret = os.getenv('TRADINGVIEW_WEBHOOK_SECRET')
+        if webhook_secret:
+            self.config.setdefault('tradingview', {})['webhook_secret'] = webhook_secret
+
+    def _finalize(self):
+        """Index the merged config and freeze its top level against mutation."""
+        self._flat = self._flatten(self.config)
+        self.config = MappingProxyType(self.config)
+
+    @staticmethod
+    def _flatten(config: Mapping[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """
+        Index every value in the config by its dotted key path.
+
+        Nested sections are indexed as well as their leaves, so both
+        'oanda' and 'oanda.environment' resolve. None values are skipped
+        so lookups fall back to the caller's default.
+
+        Args:
+            config: Configuration dict to index
+            prefix: Dotted path of the enclosing section
+
+        Returns:
+            Flat dict mapping key paths to values
+        """
+        flat = {}
+        for key, value in config.items():
+            if value is None or not isinstance(key, str):
+                continue
+            path = prefix + key
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(ConfigLoader._flatten(value, path + '.'))
+        return flat
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -126,18 +169,7 @@ class ConfigLoader:
         Returns:
             Configuration value or default
         """
-        keys = key_path.split('.')
-        value = self.config
-
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-                if value is None:
-                    return default
-            else:
-                return default
-
-        return value
+        return self._flat.get(key_path, default)
 
     def get_oanda_config(self) -> Dict[str, Any]:
         """Get OANDA API configuration."""
@@ -173,11 +205,13 @@ class ConfigLoader:
         """Reload configuration from file."""
         self.config = self._load_config()
         self._merge_env_variables()
+        self._finalize()
         logger.info("Configuration reloaded")
 
 
 # Global config instance
 _config_instance: Optional[ConfigLoader] = None
+_config_lock = threading.Lock()
 
 
 def get_config(config_path: Optional[str] = None) -> ConfigLoader:
@@ -192,5 +226,8 @@ def get_config(config_path: Optional[str] = None) -> ConfigLoader:
     """
     global _config_instance
     if _config_instance is None:
-        _config_instance = ConfigLoader(config_path)
+        with _config_lock:
+            # Re-check under the lock so only one thread loads the config
+            if _config_instance is None:
+                _config_instance = ConfigLoader(config_path)
     return _config_instance
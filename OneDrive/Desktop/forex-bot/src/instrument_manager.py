@@ -1,9 +1,16 @@
 """
 Instrument manager for handling forex pairs and futures contracts.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from enum import Enum
+from functools import lru_cache
 import logging
+import sys
+import threading
+
+import numpy as np
+
+from .pip_kernels import pips_batch, price_from_pips_batch
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +24,34 @@ class AssetType(Enum):
     INDEX = "index"
 
 
+# '/' -> '_' and ASCII lowercase -> uppercase in a single pass
+_NORMALIZE_TABLE = str.maketrans({
+    '/': '_',
+    **{c: c.upper() for c in 'abcdefghijklmnopqrstuvwxyz'}
+})
+
+
+@lru_cache(maxsize=512)
+def _normalize_symbol_cached(symbol: str) -> str:
+    """Normalize a symbol; shared process-wide since it has no state."""
+    # Swap slashes for underscores and uppercase
+    symbol = symbol.translate(_NORMALIZE_TABLE)
+
+    # Handle symbols without separator
+    if len(symbol) == 6 and '_' not in symbol:
+        # Assume it's a forex pair like EURUSD
+        symbol = f"{symbol[:3]}_{symbol[3:]}"
+
+    # Interned so dict lookups against instrument keys match by identity
+    return sys.intern(symbol)
+
+
 class Instrument:
     """Represents a tradeable instrument."""
 
+    __slots__ = ('symbol', 'asset_type', 'pip_value', 'min_trade_size',
+                 'max_trade_size', 'description')
+
     def __init__(
         self,
         symbol: str,
@@ -82,32 +114,51 @@ class InstrumentManager:
         '6J': {'pip_value': 12.5, 'description': 'Japanese Yen Futures'},
     }
 
+    # Default instrument rows and pip values, built once at import with
+    # interned symbols
+    _DEFAULT_ROWS = tuple(
+        (sys.intern(symbol), asset_type, data['pip_value'], data['description'])
+        for asset_type, table in (
+            (AssetType.FOREX, FOREX_PAIRS),
+            (AssetType.FUTURES, FUTURES_CONTRACTS)
+        )
+        for symbol, data in table.items()
+    )
+    _DEFAULT_PIP_VALUES = {row[0]: row[2] for row in _DEFAULT_ROWS}
+
     def __init__(self):
         """Initialize the instrument manager."""
         self.instruments: Dict[str, Instrument] = {}
+        # Secondary index kept in step with self.instruments by add_instrument
+        self._by_type: Dict[AssetType, List[Instrument]] = {t: [] for t in AssetType}
+        # Symbol -> pip value, so get_pip_value is a single dict lookup
+        self._pip_value_map: Dict[str, float] = {}
+        # (symbol -> row, {dtype: pip value array}) for the batch helpers,
+        # swapped in as one tuple and rebuilt lazily after instruments are added
+        self._pip_index = ({}, {})
+        self._pip_index_dirty = True
         self._load_default_instruments()
 
     def _load_default_instruments(self):
         """Load default forex pairs and futures contracts."""
-        # Load forex pairs
-        for symbol, data in self.FOREX_PAIRS.items():
-            self.add_instrument(
-                symbol=symbol,
-                asset_type=AssetType.FOREX,
-                pip_value=data['pip_value'],
-                description=data['description']
-            )
-
-        # Load futures contracts
-        for symbol, data in self.FUTURES_CONTRACTS.items():
-            self.add_instrument(
+        # Build forex pairs and futures contracts in one go rather than
+        # going through add_instrument for each
+        built = [
+            Instrument(
                 symbol=symbol,
-                asset_type=AssetType.FUTURES,
-                pip_value=data['pip_value'],
-                description=data['description']
+                asset_type=asset_type,
+                pip_value=pip_value,
+                description=description
             )
+            for symbol, asset_type, pip_value, description in self._DEFAULT_ROWS
+        ]
+        self.instruments.update((inst.symbol, inst) for inst in built)
+        for inst in built:
+            self._by_type[inst.asset_type].append(inst)
+        self._pip_value_map.update(self._DEFAULT_PIP_VALUES)
+        self._pip_index_dirty = True
 
-        logger.info(f"Loaded {len(self.instruments)} default instruments")
+        logger.info("Loaded %d default instruments", len(self.instruments))
 
     def add_instrument(
         self,
@@ -132,6 +183,7 @@ class InstrumentManager:
         Returns:
             Created instrument
         """
+        symbol = sys.intern(symbol)
         instrument = Instrument(
             symbol=symbol,
             asset_type=asset_type,
@@ -140,8 +192,14 @@ class InstrumentManager:
             max_trade_size=max_trade_size,
             description=description
         )
+        previous = self.instruments.get(symbol)
+        if previous is not None:
+            self._by_type[previous.asset_type].remove(previous)
         self.instruments[symbol] = instrument
-        logger.debug(f"Added instrument: {instrument}")
+        self._by_type[asset_type].append(instrument)
+        self._pip_value_map[symbol] = pip_value
+        self._pip_index_dirty = True
+        logger.debug("Added instrument: %s", instrument)
         return instrument
 
     def get_instrument(self, symbol: str) -> Optional[Instrument]:
@@ -166,10 +224,7 @@ class InstrumentManager:
         Returns:
             List of instruments
         """
-        return [
-            inst for inst in self.instruments.values()
-            if inst.asset_type == asset_type
-        ]
+        return list(self._by_type[asset_type])
 
     def get_forex_pairs(self) -> List[Instrument]:
         """Get all forex pairs."""
@@ -193,8 +248,7 @@ class InstrumentManager:
         Returns:
             Pip value or default 0.0001
         """
-        instrument = self.get_instrument(symbol)
-        return instrument.pip_value if instrument else 0.0001
+        return self._pip_value_map.get(symbol, 0.0001)
 
     def calculate_pips(self, symbol: str, price_diff: float) -> float:
         """
@@ -224,6 +278,71 @@ class InstrumentManager:
         pip_value = self.get_pip_value(symbol)
         return pips * pip_value
 
+    def _rebuild_pip_index(self):
+        """Rebuild the symbol index and pip value array used by batch helpers."""
+        self._pip_index_dirty = False
+        instruments = list(self.instruments.values())
+        symbol_to_idx = {inst.symbol: i for i, inst in enumerate(instruments)}
+        # Trailing slot holds the default pip value for unknown symbols (index -1)
+        pip_values = np.array(
+            [inst.pip_value for inst in instruments] + [0.0001],
+            dtype=np.float64
+        )
+        # float32 copy halves memory traffic for float32 batches; float64
+        # input keeps the exact table so results don't pick up rounding
+        tables = {
+            np.dtype(np.float64): pip_values,
+            np.dtype(np.float32): pip_values.astype(np.float32)
+        }
+        self._pip_index = (symbol_to_idx, tables)
+
+    def _pip_values_for(self, symbols: Sequence[str], dtype: np.dtype) -> np.ndarray:
+        """Look up pip values for a sequence of symbols as float32 or float64."""
+        if self._pip_index_dirty:
+            self._rebuild_pip_index()
+        symbol_to_idx, tables = self._pip_index
+        lookup = symbol_to_idx.get
+        idx = np.fromiter((lookup(s, -1) for s in symbols), dtype=np.intp, count=len(symbols))
+        return tables[dtype][idx]
+
+    @staticmethod
+    def _as_float_array(values) -> np.ndarray:
+        """Convert batch input to a float array, keeping float32 as float32."""
+        values = np.asarray(values)
+        if values.dtype != np.float32:
+            values = values.astype(np.float64, copy=False)
+        return values
+
+    def calculate_pips_batch(self, symbols: Sequence[str], price_diffs) -> np.ndarray:
+        """
+        Calculate pips for many price differences at once.
+
+        Args:
+            symbols: Instrument symbol for each price difference
+            price_diffs: Array-like of price differences
+
+        Returns:
+            Array of pip counts (float32 if price_diffs is float32,
+            otherwise float64)
+        """
+        price_diffs = self._as_float_array(price_diffs)
+        return pips_batch(price_diffs, self._pip_values_for(symbols, price_diffs.dtype))
+
+    def calculate_price_from_pips_batch(self, symbols: Sequence[str], pips) -> np.ndarray:
+        """
+        Calculate price differences for many pip counts at once.
+
+        Args:
+            symbols: Instrument symbol for each pip count
+            pips: Array-like of pip counts
+
+        Returns:
+            Array of price differences (float32 if pips is float32,
+            otherwise float64)
+        """
+        pips = self._as_float_array(pips)
+        return price_from_pips_batch(pips, self._pip_values_for(symbols, pips.dtype))
+
     def normalize_symbol(self, symbol: str) -> str:
         """
         Normalize instrument symbol.
@@ -239,18 +358,7 @@ class InstrumentManager:
         Returns:
             Normalized symbol
         """
-        # Remove forward slashes
-        symbol = symbol.replace('/', '_')
-
-        # Handle symbols without separator
-        if '_' not in symbol and len(symbol) == 6:
-            # Assume it's a forex pair like EURUSD
-            symbol = f"{symbol[:3]}_{symbol[3:]}"
-
-        # Convert to uppercase
-        symbol = symbol.upper()
-
-        return symbol
+        return _normalize_symbol_cached(symbol)
 
     def get_all_symbols(self) -> List[str]:
         """Get list of all available symbols."""
@@ -271,6 +379,7 @@ class InstrumentManager:
 
 # Global instrument manager instance
 _manager_instance: Optional[InstrumentManager] = None
+_manager_lock = threading.Lock()
 
 
 def get_instrument_manager() -> InstrumentManager:
@@ -282,5 +391,8 @@ def get_instrument_manager() -> InstrumentManager:
     """
     global _manager_instance
     if _manager_instance is None:
-        _manager_instance = InstrumentManager()
+        with _manager_lock:
+            # Re-check under the lock so only one thread builds the manager
+            if _manager_instance is None:
+                _manager_instance = InstrumentManager()
     return _manager_instance
@@ -0,0 +1,39 @@
+"""
+Flask JSON provider backed by orjson.
+"""
+from typing import Any, Union
+from flask.json.provider import DefaultJSONProvider
+import orjson
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Encode and decode Flask JSON (jsonify, request.get_json) with orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON.
+
+        Args:
+            obj: Data to serialize
+            **kwargs: Flask dump arguments; only ``indent`` is honoured
+
+        Returns:
+            JSON string
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """
+        Deserialize data as JSON.
+
+        Args:
+            s: JSON text or bytes
+            **kwargs: Ignored; kept for provider compatibility
+
+        Returns:
+            Decoded data
+        """
+        return orjson.loads(s)
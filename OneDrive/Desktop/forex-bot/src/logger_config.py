@@ -1,12 +1,48 @@
 """
 Logging configuration for the trading bot.
 """
+import atexit
+import copy
 import logging
 import logging.handlers
+import queue
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import colorlog
 
+# Messages routed to trades.log
+_TRADE_RE = re.compile(r'trade|order', re.IGNORECASE)
+
+# Background listeners that write queued records to the console and log
+# files, by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for an in-process queue.
+
+    Like the base class, the message is rendered on the calling thread, so
+    later changes to the logged objects don't show up in the output.
+    Unlike the base class, exc_info is passed through as is: tracebacks
+    are formatted by the listener's handlers, off the calling thread, and
+    stay out of TradeFilter's match.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class TradeFilter(logging.Filter):
+    """Pass only trade- or order-related records."""
+
+    def filter(self, record):
+        return _TRADE_RE.search(record.getMessage()) is not None
+
 
 def setup_logger(
     name: str = 'forex_bot',
@@ -36,6 +72,7 @@ def setup_logger(
 
     # Remove existing handlers
     logger.handlers.clear()
+    stop_logging(name)
 
     # Console handler with color
     console_handler = colorlog.StreamHandler()
@@ -54,7 +91,7 @@ def setup_logger(
         }
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler
     if log_to_file:
@@ -76,7 +113,6 @@ def setup_logger(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
 
         # Separate file for errors
         error_handler = logging.handlers.RotatingFileHandler(
@@ -86,7 +122,6 @@ def setup_logger(
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(file_formatter)
-        logger.addHandler(error_handler)
 
         # Trade log file
         trade_handler = logging.handlers.RotatingFileHandler(
@@ -98,16 +133,41 @@ def setup_logger(
         trade_handler.setFormatter(file_formatter)
 
         # Add filter to only log trade-related messages
-        class TradeFilter(logging.Filter):
-            def filter(self, record):
-                return 'trade' in record.getMessage().lower() or 'order' in record.getMessage().lower()
-
         trade_handler.addFilter(TradeFilter())
-        logger.addHandler(trade_handler)
+
+        handlers += [file_handler, error_handler, trade_handler]
+
+    # Formatting (tracebacks included), writes and rotation happen on the
+    # listener thread; callers only enqueue the record
+    log_queue = queue.Queue(-1)
+    logger.addHandler(_LocalQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    _listeners[name] = listener
 
     return logger
 
 
+def stop_logging(name: Optional[str] = None):
+    """
+    Flush queued records to the console and log files and stop the
+    listener threads.
+
+    Args:
+        name: Only stop the listener for this logger (defaults to all)
+    """
+    names = [name] if name is not None else list(_listeners)
+    for key in names:
+        listener = _listeners.pop(key, None)
+        if listener is not None:
+            listener.stop()
+
+
+atexit.register(stop_logging)
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Get a logger instance.
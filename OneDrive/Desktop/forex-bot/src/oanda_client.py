@@ -4,17 +4,150 @@ OANDA API client for forex and futures trading.
 import oandapyV20
 from oandapyV20 import API
 from oandapyV20.endpoints import accounts, orders, positions, pricing, trades, instruments
-from oandapyV20.exceptions import V20Error
-from typing import Dict, List, Optional, Any
+from oandapyV20.exceptions import V20Error, StreamTerminated
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+import orjson
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Any, Union
 import logging
+import re
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
+# OANDA sends decimals as strings; these fields are converted to float once
+# when a response is parsed
+NUMERIC_ACCOUNT_FIELDS = ('balance', 'NAV', 'unrealizedPL', 'pl', 'marginUsed',
+                          'marginAvailable', 'positionValue')
+NUMERIC_POSITION_FIELDS = ('units', 'unrealizedPL', 'averagePrice', 'pl')
+
+
+def _to_floats(record: Dict[str, Any], fields) -> Dict[str, Any]:
+    """Convert the given fields of a response record to float in place."""
+    for field in fields:
+        value = record.get(field)
+        if value is not None:
+            record[field] = float(value)
+    return record
+
+
+def _parse_positions(position_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert numeric fields of each position and its long/short sides."""
+    for position in position_list:
+        _to_floats(position, NUMERIC_POSITION_FIELDS)
+        for side in ('long', 'short'):
+            if side in position:
+                _to_floats(position[side], NUMERIC_POSITION_FIELDS)
+    return position_list
+
+
+class OandaErrorKind(Enum):
+    """Order failures the bot reports specially."""
+    MARKET_HALTED = "market_halted"
+    INSUFFICIENT_AUTH = "insufficient_auth"
+    CLOSEOUT = "closeout"
+    OTHER = "other"
+
+
+@dataclass(frozen=True)
+class OandaError:
+    """A failed order request, returned instead of raised."""
+    kind: OandaErrorKind
+    message: str
+    code: Optional[str] = None  # OANDA errorCode / rejectReason, if any
+
+
+# OANDA error codes and reject reasons that map to a specific kind
+_ERROR_CODE_KINDS = {
+    'MARKET_HALTED': OandaErrorKind.MARKET_HALTED,
+    'INSUFFICIENT_AUTHORIZATION': OandaErrorKind.INSUFFICIENT_AUTH,
+}
+
+# Fallback for error bodies without a structured code
+_ERROR_TEXT_RE = re.compile(
+    r'(MARKET_HALTED|market is not tradeable)|(Insufficient authorization)|(closeout)',
+    re.IGNORECASE
+)
+_ERROR_TEXT_KINDS = (
+    OandaErrorKind.MARKET_HALTED,
+    OandaErrorKind.INSUFFICIENT_AUTH,
+    OandaErrorKind.CLOSEOUT,
+)
+
+
+def _error_kind(code: Optional[str], text: str) -> OandaErrorKind:
+    """Classify an error by its OANDA code, falling back to its text."""
+    if code:
+        kind = _ERROR_CODE_KINDS.get(code)
+        if kind is not None:
+            return kind
+        if 'CLOSEOUT' in code:
+            return OandaErrorKind.CLOSEOUT
+    match = _ERROR_TEXT_RE.search(text)
+    if match is None:
+        return OandaErrorKind.OTHER
+    return _ERROR_TEXT_KINDS[match.lastindex - 1]
+
+
+def _parse_v20_error(error: V20Error) -> OandaError:
+    """Build an OandaError from an HTTP error response."""
+    text = str(error.msg)
+    try:
+        body = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        body = None
+    if not isinstance(body, dict):
+        body = {}
+
+    reject = body.get('orderRejectTransaction') or {}
+    code = body.get('errorCode') or reject.get('rejectReason')
+    message = body.get('errorMessage') or text
+    return OandaError(kind=_error_kind(code, text), message=message, code=code)
+
+
+def _parse_price(price: Dict[str, Any]) -> Dict[str, float]:
+    """Extract top-of-book bid/ask and spread from a pricing record."""
+    bids = price.get('bids')
+    asks = price.get('asks')
+    bid = float(bids[0]['price']) if bids else 0.0
+    ask = float(asks[0]['price']) if asks else 0.0
+    return {'bid': bid, 'ask': ask, 'spread': ask - bid}
+
+
+def count_open_positions(position_list: List[Dict[str, Any]]) -> int:
+    """Count positions with non-zero long or short units (parsed floats)."""
+    return sum(
+        1 for p in position_list
+        if p.get('long', {}).get('units', 0.0) != 0
+        or p.get('short', {}).get('units', 0.0) != 0
+    )
+
+
 class OandaClient:
     """Client for interacting with OANDA API."""
 
-    def __init__(self, account_id: str, api_key: str, environment: str = 'practice'):
+    # Seconds without a stream message (price or heartbeat) before cached
+    # prices are considered stale
+    STREAM_STALE_AFTER = 10.0
+
+    # Read timeout for the pricing stream; OANDA sends a heartbeat every 5
+    # seconds, so a silent connection this long has dropped
+    STREAM_READ_TIMEOUT = 20.0
+
+    def __init__(
+        self,
+        account_id: str,
+        api_key: str,
+        environment: str = 'practice',
+        pool_connections: int = 4,
+        pool_maxsize: int = 16
+    ):
         """
         Initialize OANDA client.
 
@@ -22,6 +155,8 @@ class OandaClient:
             account_id: OANDA account ID
             api_key: OANDA API key
             environment: 'practice' or 'live'
+            pool_connections: Number of host connection pools to cache
+            pool_maxsize: Maximum keep-alive connections per host
         """
         self.account_id = account_id
         self.environment = environment
@@ -32,21 +167,77 @@ class OandaClient:
             environment=environment
         )
 
-        logger.info(f"OANDA client initialized for {environment} environment")
+        # The API client keeps one requests.Session for its lifetime, so TLS
+        # connections are reused across calls; size its pool for concurrent
+        # callers and retry idempotent reads on transient errors
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+        self.client.client.mount('https://', adapter)
+
+        # The pricing stream gets its own client: a read timeout on the
+        # shared session would also apply to REST calls
+        self._stream_client = API(
+            access_token=api_key,
+            environment=environment,
+            request_params={'timeout': self.STREAM_READ_TIMEOUT}
+        )
+
+        # Latest prices fed by the optional pricing stream
+        self._prices: Dict[str, Dict[str, float]] = {}
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_stop = threading.Event()
+        self._stream_last_seen = 0.0
+
+        logger.info("OANDA client initialized for %s environment", environment)
+
+    @property
+    def session(self) -> requests.Session:
+        """The keep-alive HTTP session shared by all REST calls."""
+        return self.client.client
 
     def get_account_summary(self) -> Dict[str, Any]:
         """
         Get account summary information.
 
         Returns:
-            Account summary data
+            Account summary data, numeric fields as float
         """
         try:
             endpoint = accounts.AccountSummary(accountID=self.account_id)
             response = self.client.request(endpoint)
-            return response.get('account', {})
+            return _to_floats(response.get('account', {}), NUMERIC_ACCOUNT_FIELDS)
         except V20Error as e:
-            logger.error(f"Error getting account summary: {e}")
+            logger.error("Error getting account summary: %s", e)
+            raise
+
+    def get_account_details(self) -> Dict[str, Any]:
+        """
+        Get full account details in a single request.
+
+        The response includes the account summary fields together with its
+        'positions', 'trades' and 'orders' lists.
+
+        Returns:
+            Account details data, numeric account and position fields as float
+        """
+        try:
+            endpoint = accounts.AccountDetails(accountID=self.account_id)
+            response = self.client.request(endpoint)
+            account = _to_floats(response.get('account', {}), NUMERIC_ACCOUNT_FIELDS)
+            _parse_positions(account.get('positions', []))
+            return account
+        except V20Error as e:
+            logger.error("Error getting account details: %s", e)
             raise
 
     def get_account_balance(self) -> float:
@@ -64,21 +255,20 @@ class OandaClient:
         Get all current open positions.
 
         Returns:
-            List of open positions
+            List of open positions, numeric fields as float
         """
         try:
             endpoint = positions.OpenPositions(accountID=self.account_id)
             response = self.client.request(endpoint)
-            return response.get('positions', [])
+            return _parse_positions(response.get('positions', []))
         except V20Error as e:
-            logger.error(f"Error getting positions: {e}")
+            logger.error("Error getting positions: %s", e)
             return []
 
     def get_position_count(self) -> int:
         """Get the number of open positions."""
-        positions = self.get_current_positions()
-        return len([p for p in positions if float(p.get('long', {}).get('units', 0)) != 0
-                    or float(p.get('short', {}).get('units', 0)) != 0])
+        # Units are already floats (see _parse_positions), so no re-parsing
+        return count_open_positions(self.get_current_positions())
 
     def get_current_price(self, instrument: str) -> Dict[str, float]:
         """
@@ -90,6 +280,13 @@ class OandaClient:
         Returns:
             Dict with 'bid' and 'ask' prices
         """
+        # Serve from the pricing stream while it is alive (OANDA heartbeats
+        # every 5 seconds, so silence beyond STREAM_STALE_AFTER means it's down)
+        if time.monotonic() - self._stream_last_seen < self.STREAM_STALE_AFTER:
+            cached = self._prices.get(instrument)
+            if cached is not None:
+                return cached
+
         try:
             params = {"instruments": instrument}
             endpoint = pricing.PricingInfo(accountID=self.account_id, params=params)
@@ -97,18 +294,116 @@ class OandaClient:
 
             prices = response.get('prices', [])
             if prices:
-                price = prices[0]
-                return {
-                    'bid': float(price.get('bids', [{}])[0].get('price', 0)),
-                    'ask': float(price.get('asks', [{}])[0].get('price', 0)),
-                    'spread': float(price.get('asks', [{}])[0].get('price', 0)) -
-                             float(price.get('bids', [{}])[0].get('price', 0))
-                }
+                return _parse_price(prices[0])
             return {'bid': 0, 'ask': 0, 'spread': 0}
         except V20Error as e:
-            logger.error(f"Error getting price for {instrument}: {e}")
+            logger.error("Error getting price for %s: %s", instrument, e)
             return {'bid': 0, 'ask': 0, 'spread': 0}
 
+    def get_current_prices(self, instrument_list: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Get current bid/ask prices for several instruments in one request.
+
+        Args:
+            instrument_list: Instrument symbols
+
+        Returns:
+            Dict mapping instrument to its 'bid', 'ask' and 'spread'
+            (zeros for instruments OANDA returned no price for)
+        """
+        result = {}
+        missing = list(instrument_list)
+
+        # Same rule as get_current_price: use the stream cache while it's live
+        if time.monotonic() - self._stream_last_seen < self.STREAM_STALE_AFTER:
+            missing = []
+            for instrument in instrument_list:
+                cached = self._prices.get(instrument)
+                if cached is not None:
+                    result[instrument] = cached
+                else:
+                    missing.append(instrument)
+
+        if missing:
+            try:
+                params = {"instruments": ",".join(missing)}
+                endpoint = pricing.PricingInfo(accountID=self.account_id, params=params)
+                response = self.client.request(endpoint)
+                for price in response.get('prices', []):
+                    result[price['instrument']] = _parse_price(price)
+            except V20Error as e:
+                logger.error("Error getting prices for %s: %s", params['instruments'], e)
+
+        for instrument in missing:
+            result.setdefault(instrument, {'bid': 0, 'ask': 0, 'spread': 0})
+        return result
+
+    def start_pricing_stream(self, instrument_list: List[str]):
+        """
+        Stream prices for the given instruments into a local cache.
+
+        While the stream is connected, get_current_price answers from the
+        cache instead of making a REST request.
+
+        Args:
+            instrument_list: Instrument symbols to subscribe to
+        """
+        if self._stream_thread is not None and self._stream_thread.is_alive():
+            logger.warning("Pricing stream already running")
+            return
+
+        self._stream_stop.clear()
+        self._stream_thread = threading.Thread(
+            target=self._run_pricing_stream,
+            args=(list(instrument_list),),
+            name='oanda-pricing-stream',
+            daemon=True
+        )
+        self._stream_thread.start()
+        logger.info("Pricing stream started for %s", ', '.join(instrument_list))
+
+    def stop_pricing_stream(self):
+        """Stop the pricing stream; get_current_price falls back to REST."""
+        self._stream_stop.set()
+        self._stream_last_seen = 0.0
+
+    def _run_pricing_stream(self, instrument_list: List[str], max_backoff: float = 60.0):
+        """
+        Consume the pricing stream, reconnecting with backoff on errors.
+
+        Args:
+            instrument_list: Instrument symbols to subscribe to
+            max_backoff: Upper bound in seconds on the reconnect delay
+        """
+        params = {"instruments": ",".join(instrument_list)}
+        backoff = 1.0
+
+        while not self._stream_stop.is_set():
+            endpoint = pricing.PricingStream(accountID=self.account_id, params=params)
+            try:
+                for message in self._stream_client.request(endpoint):
+                    if self._stream_stop.is_set():
+                        endpoint.terminate("Pricing stream stopped")
+                    self._stream_last_seen = time.monotonic()
+                    backoff = 1.0
+
+                    if message.get('type') == 'PRICE':
+                        self._prices[message['instrument']] = _parse_price(message)
+            except StreamTerminated:
+                break
+            except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError) as e:
+                # A read timeout mid-stream surfaces as a ConnectionError
+                logger.warning(
+                    "Pricing stream dropped, reconnecting in %.0fs: %s", backoff, e
+                )
+            except Exception as e:
+                logger.error("Pricing stream error, reconnecting in %.0fs: %s", backoff, e)
+
+            self._stream_stop.wait(backoff)
+            backoff = min(backoff * 2, max_backoff)
+
+        logger.info("Pricing stream stopped")
+
     def place_market_order(
         self,
         instrument: str,
@@ -116,7 +411,7 @@ class OandaClient:
         stop_loss: Optional[float] = None,
         take_profit: Optional[float] = None,
         trailing_stop: Optional[float] = None
-    ) -> Dict[str, Any]:
+    ) -> Union[Dict[str, Any], OandaError]:
         """
         Place a market order.
 
@@ -128,7 +423,8 @@ class OandaClient:
             trailing_stop: Trailing stop distance in pips
 
         Returns:
-            Order response
+            Order response, or an OandaError if the order was rejected,
+            cancelled or the request failed
         """
         order_data = {
             "order": {
@@ -159,11 +455,27 @@ class OandaClient:
         try:
             endpoint = orders.OrderCreate(accountID=self.account_id, data=order_data)
             response = self.client.request(endpoint)
-            logger.info(f"Market order placed: {instrument} {units} units")
-            return response
         except V20Error as e:
-            logger.error(f"Error placing market order: {e}")
-            raise
+            logger.error("Error placing market order: %s", e)
+            return _parse_v20_error(e)
+        except requests.RequestException as e:
+            logger.error("Error placing market order: %s", e)
+            return OandaError(kind=OandaErrorKind.OTHER, message=str(e))
+
+        # A market order OANDA can't fill (e.g. market halted) is created
+        # and then cancelled, with a 201 response
+        cancel = response.get('orderCancelTransaction')
+        if cancel is not None and 'orderFillTransaction' not in response:
+            reason = cancel.get('reason', 'UNKNOWN')
+            logger.error("Market order cancelled: %s %s units (%s)", instrument, units, reason)
+            return OandaError(
+                kind=_error_kind(reason, reason),
+                message=f"Order cancelled: {reason}",
+                code=reason
+            )
+
+        logger.info("Market order placed: %s %s units", instrument, units)
+        return response
 
     def place_limit_order(
         self,
@@ -205,10 +517,10 @@ class OandaClient:
         try:
             endpoint = orders.OrderCreate(accountID=self.account_id, data=order_data)
             response = self.client.request(endpoint)
-            logger.info(f"Limit order placed: {instrument} {units} units at {price}")
+            logger.info("Limit order placed: %s %s units at %s", instrument, units, price)
             return response
         except V20Error as e:
-            logger.error(f"Error placing limit order: {e}")
+            logger.error("Error placing limit order: %s", e)
             raise
 
     def close_position(self, instrument: str, units: Optional[str] = "ALL") -> Dict[str, Any]:
@@ -235,7 +547,7 @@ class OandaClient:
                 data=data
             )
             response = self.client.request(endpoint)
-            logger.info(f"Position closed: {instrument}")
+            logger.info("Position closed: %s", instrument)
             return response
         except V20Error as e:
             # Try closing short position
@@ -250,10 +562,10 @@ class OandaClient:
                     data=data
                 )
                 response = self.client.request(endpoint)
-                logger.info(f"Position closed: {instrument}")
+                logger.info("Position closed: %s", instrument)
                 return response
             except V20Error as e2:
-                logger.error(f"Error closing position: {e2}")
+                logger.error("Error closing position: %s", e2)
                 raise
 
     def get_open_trades(self) -> List[Dict[str, Any]]:
@@ -268,7 +580,7 @@ class OandaClient:
             response = self.client.request(endpoint)
             return response.get('trades', [])
         except V20Error as e:
-            logger.error(f"Error getting open trades: {e}")
+            logger.error("Error getting open trades: %s", e)
             return []
 
     def modify_trade(
@@ -308,10 +620,10 @@ class OandaClient:
                 data=data
             )
             response = self.client.request(endpoint)
-            logger.info(f"Trade modified: {trade_id}")
+            logger.info("Trade modified: %s", trade_id)
             return response
         except V20Error as e:
-            logger.error(f"Error modifying trade: {e}")
+            logger.error("Error modifying trade: %s", e)
             raise
 
     def get_candles(
@@ -340,5 +652,56 @@ class OandaClient:
             response = self.client.request(endpoint)
             return response.get('candles', [])
         except V20Error as e:
-            logger.error(f"Error getting candles: {e}")
+            logger.error("Error getting candles: %s", e)
             return []
+
+    def get_candles_arrays(
+        self,
+        instrument: str,
+        granularity: str = "H1",
+        count: int = 500
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get historical mid-price candles as column arrays.
+
+        Args:
+            instrument: Instrument symbol
+            granularity: Candle granularity (M1, M5, H1, H4, D, etc.)
+            count: Number of candles to retrieve
+
+        Returns:
+            Dict of equal-length arrays: 'time' (datetime64[ns]), 'open',
+            'high', 'low', 'close' (float64), 'volume' (int64) and
+            'complete' (bool)
+        """
+        candles = self.get_candles(instrument, granularity, count)
+        n = len(candles)
+
+        times = np.empty(n, dtype='datetime64[ns]')
+        opens = np.empty(n, dtype=np.float64)
+        highs = np.empty(n, dtype=np.float64)
+        lows = np.empty(n, dtype=np.float64)
+        closes = np.empty(n, dtype=np.float64)
+        volumes = np.empty(n, dtype=np.int64)
+        complete = np.empty(n, dtype=bool)
+
+        for i, candle in enumerate(candles):
+            mid = candle['mid']
+            # RFC 3339 timestamp; numpy parses it once the 'Z' suffix is dropped
+            times[i] = np.datetime64(candle['time'].rstrip('Z'))
+            opens[i] = mid['o']
+            highs[i] = mid['h']
+            lows[i] = mid['l']
+            closes[i] = mid['c']
+            volumes[i] = candle.get('volume', 0)
+            complete[i] = candle.get('complete', True)
+
+        return {
+            'time': times,
+            'open': opens,
+            'high': highs,
+            'low': lows,
+            'close': closes,
+            'volume': volumes,
+            'complete': complete
+        }
@@ -0,0 +1,41 @@
+"""
+Batch pip kernels, JIT-compiled with Numba when it is installed.
+
+The kernels are written as NumPy array expressions, which run as is
+without Numba and which Numba fuses and parallelises when it is present.
+"""
+import numpy as np
+
+from ._jit import njit
+
+
+# cache=True stores the compiled code next to this module so the
+# compile cost is paid once per environment, not per process
+@njit(cache=True, parallel=True, fastmath=True)
+def pips_batch(price_diffs, pip_values):
+    """
+    Convert price differences to pip counts.
+
+    Args:
+        price_diffs: 1-D array of price differences
+        pip_values: 1-D array of pip values, same length
+
+    Returns:
+        Array of pip counts
+    """
+    return np.abs(price_diffs) / pip_values
+
+
+@njit(cache=True, parallel=True, fastmath=True)
+def price_from_pips_batch(pips, pip_values):
+    """
+    Convert pip counts to price differences.
+
+    Args:
+        pips: 1-D array of pip counts
+        pip_values: 1-D array of pip values, same length
+
+    Returns:
+        Array of price differences
+    """
+    return pips * pip_values
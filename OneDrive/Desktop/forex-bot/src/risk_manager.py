@@ -1,25 +1,239 @@
 """
 Risk management and position sizing for the trading bot.
 """
-from typing import Dict, Optional, Any
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Dict, Optional, Any, Sequence
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import json
 import logging
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from ._njit_risk import _position_size_batch
 
 logger = logging.getLogger(__name__)
 
 
+def default_state_path() -> Path:
+    """Location the bot persists PnL state to ($DATA_DIR, default 'data').
+
+    Relative directories are resolved against the project root, like the
+    config path, not the working directory.
+    """
+    base_dir = Path(__file__).parent.parent
+    return base_dir / os.getenv('DATA_DIR', 'data') / 'risk_state.json'
+
+
+class RiskRejectReason(IntEnum):
+    """Outcome of RiskManager.can_open_position."""
+    OK = 0
+    DISABLED = 1
+    MAX_POSITIONS = 2
+    DAILY = 3
+    WEEKLY = 4
+    TOTAL_RISK = 5
+
+
+@dataclass(frozen=True, slots=True)
+class _InstrumentLimits:
+    """Per-instrument settings read from the 'instruments' config section."""
+    min_trade_size: int
+    max_trade_size: int
+    max_spread: Optional[float]
+    min_risk_reward_ratio: float
+    enabled: bool
+
+
+def _make_validator(instrument: str, limits: _InstrumentLimits) -> Callable[..., tuple[bool, str]]:
+    """
+    Build a trade validator specialised to one instrument's limits.
+
+    Checks that the limits switch off (disabled instrument, no max spread,
+    no minimum risk/reward) are left out of the returned function.
+
+    Args:
+        instrument: Instrument symbol
+        limits: The instrument's config limits
+
+    Returns:
+        validator(entry_price, stop_loss, take_profit, spread) -> (is_valid, reason)
+    """
+    if not limits.enabled:
+        reason = f"Instrument {instrument} is not enabled"
+
+        def reject(entry_price, stop_loss, take_profit, spread):
+            return False, reason
+        return reject
+
+    max_spread = limits.max_spread
+    min_rr_ratio = limits.min_risk_reward_ratio
+    check_spread = bool(max_spread)
+    check_rr = min_rr_ratio > 0
+    min_rr_squared = min_rr_ratio * min_rr_ratio
+
+    def validator(entry_price, stop_loss, take_profit, spread):
+        # Check spread
+        if check_spread and spread and spread > max_spread:
+            return False, f"Spread too high: {spread} pips (max: {max_spread})"
+
+        # Validate stop loss
+        if stop_loss is not None and stop_loss == entry_price:
+            return False, "Stop loss cannot equal entry price"
+
+        # Validate take profit
+        if take_profit is not None and take_profit == entry_price:
+            return False, "Take profit cannot equal entry price"
+
+        # Validate risk/reward ratio (optional)
+        # Compared squared, as the signs of the distances don't matter; the
+        # ratio itself is only computed for the rejection message
+        if check_rr and stop_loss and take_profit:
+            risk = entry_price - stop_loss
+            reward = take_profit - entry_price
+            if reward * reward < min_rr_squared * (risk * risk):
+                rr_ratio = abs(reward / risk)
+                return False, f"Risk/reward ratio too low: {rr_ratio:.2f} (min: {min_rr_ratio})"
+
+        return True, "OK"
+
+    return validator
+
+
+@dataclass(frozen=True, slots=True)
+class PositionSizing:
+    """Result of a position size calculation."""
+    units: int
+    sl_distance: float
+    risk_amount: float  # Amount at risk for these units if the stop is hit
+
+
 class RiskManager:
     """Manages trading risk and position sizing."""
 
-    def __init__(self, config: Dict[str, Any]):
+    __slots__ = ('config', 'risk_per_trade', 'max_positions', 'max_total_risk',
+                 'daily_loss_limit', 'weekly_loss_limit', 'auto_disable_on_limit',
+                 '_instrument_limits', '_validators', '_thresholds', '_lock',
+                 'daily_pnl', 'weekly_pnl', 'last_reset_day', 'last_reset_week',
+                 'trading_enabled', '_state_path', '_version', '_risk_status_cache')
+
+    def __init__(self, config: Dict[str, Any], state_path: Optional[str] = None):
         """
         Initialize risk manager.
 
+        Args:
+            config: Risk management configuration
+            state_path: File PnL state is persisted to, so loss limits hold
+                across restarts (default: not persisted); the bot passes
+                default_state_path()
+        """
+        # Bumped on every change get_risk_status depends on; its cached
+        # (version, balance, status) result is reused while both match
+        self._version = 0
+        self._risk_status_cache = (-1, None, None)
+
+        self.reload_config(config)
+
+        # Guards PnL and trading_enabled writes; webhook requests run on
+        # several server threads. Reads stay lock-free.
+        self._lock = threading.Lock()
+
+        # Tracking
+        self.daily_pnl = 0.0
+        self.weekly_pnl = 0.0
+        now = datetime.now()
+        self.last_reset_day = now.date()
+        self.last_reset_week = now.isocalendar().week
+        self.trading_enabled = True
+
+        self._state_path = Path(state_path) if state_path else None
+        if self._state_path is not None:
+            self._load_state(now)
+
+        logger.info("Risk manager initialized")
+
+    def _load_state(self, now: datetime):
+        """
+        Restore PnL tracking saved by a previous run.
+
+        Daily and weekly PnL are only restored if the saved day and week
+        are still current. Trading only stays disabled if it was disabled
+        today, so a limit hit on an earlier day doesn't outlive it.
+
+        Args:
+            now: Current time
+        """
+        try:
+            with open(self._state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            saved_day = date.fromisoformat(state['last_reset_day'])
+            saved_week = int(state['last_reset_week'])
+            daily_pnl = float(state['daily_pnl'])
+            weekly_pnl = float(state['weekly_pnl'])
+            trading_enabled = bool(state.get('trading_enabled', True))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable risk state %s: %s", self._state_path, e)
+            return
+
+        if saved_day == self.last_reset_day:
+            self.daily_pnl = daily_pnl
+            self.trading_enabled = trading_enabled
+        if saved_week == self.last_reset_week and (now.date() - saved_day).days < 7:
+            self.weekly_pnl = weekly_pnl
+
+        logger.info(
+            "Restored risk state (Daily: $%.2f, Weekly: $%.2f, Trading enabled: %s)",
+            self.daily_pnl, self.weekly_pnl, self.trading_enabled
+        )
+
+    def _save_state(self):
+        """
+        Persist PnL tracking, if a state path is set; caller must hold
+        self._lock.
+
+        The state is written to a temporary file and moved into place, so a
+        crash mid-write never leaves a truncated file behind.
+        """
+        if self._state_path is None:
+            return
+        state = {
+            'daily_pnl': self.daily_pnl,
+            'weekly_pnl': self.weekly_pnl,
+            'last_reset_day': self.last_reset_day.isoformat(),
+            'last_reset_week': self.last_reset_week,
+            'trading_enabled': self.trading_enabled,
+        }
+        path = self._state_path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.risk_state-', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.error("Failed to save risk state to %s: %s", path, e)
+
+    def reload_config(self, config: Dict[str, Any]):
+        """
+        Apply a (re)loaded configuration.
+
         Args:
             config: Risk management configuration
         """
         self.config = config
 
+        self._version += 1
+
         # Risk limits
         self.risk_per_trade = config.get('trading', {}).get('risk_per_trade', 0.02)
         self.max_positions = config.get('trading', {}).get('max_positions', 5)
@@ -30,14 +244,42 @@ class RiskManager:
         self.weekly_loss_limit = config.get('risk_management', {}).get('weekly_loss_limit', 0.10)
         self.auto_disable_on_limit = config.get('risk_management', {}).get('auto_disable_on_limit', True)
 
-        # Tracking
-        self.daily_pnl = 0.0
-        self.weekly_pnl = 0.0
-        self.last_reset_day = datetime.now().date()
-        self.last_reset_week = datetime.now().isocalendar()[1]
-        self.trading_enabled = True
+        # Per-instrument limits, filled lazily by _get_instrument_limits
+        self._instrument_limits: Dict[str, _InstrumentLimits] = {}
 
-        logger.info("Risk manager initialized")
+        # Specialised trade validators, prebuilt for configured instruments
+        # and added on first use for any other
+        self._validators: Dict[str, Callable[..., tuple[bool, str]]] = {
+            instrument: _make_validator(instrument, self._get_instrument_limits(instrument))
+            for instrument in config.get('instruments', {}) or {}
+        }
+
+        # (balance, daily, weekly, total risk) limits in account currency for
+        # the last balance seen, kept as one tuple so threads never mix them
+        self._thresholds = (None, 0.0, 0.0, 0.0)
+
+    def _get_instrument_limits(self, instrument: str) -> _InstrumentLimits:
+        """
+        Get the cached config limits for an instrument.
+
+        Args:
+            instrument: Instrument symbol
+
+        Returns:
+            Instrument limits
+        """
+        limits = self._instrument_limits.get(instrument)
+        if limits is None:
+            instrument_config = self.config.get('instruments', {}).get(instrument, {})
+            limits = _InstrumentLimits(
+                min_trade_size=instrument_config.get('min_trade_size', 1),
+                max_trade_size=instrument_config.get('max_trade_size', 10000000),
+                max_spread=instrument_config.get('max_spread'),
+                min_risk_reward_ratio=instrument_config.get('min_risk_reward_ratio', 0),
+                enabled=instrument_config.get('enabled', False)
+            )
+            self._instrument_limits[instrument] = limits
+        return limits
 
     def calculate_position_size(
         self,
@@ -47,7 +289,7 @@ class RiskManager:
         instrument: str,
         pip_value: float = 0.0001,
         custom_risk: Optional[float] = None
-    ) -> int:
+    ) -> PositionSizing:
         """
         Calculate position size based on risk parameters.
 
@@ -60,7 +302,7 @@ class RiskManager:
             custom_risk: Custom risk percentage (overrides default)
 
         Returns:
-            Position size in units
+            Position sizing with units, stop distance and amount at risk
         """
         # Use custom risk or default
         risk_percent = custom_risk or self.risk_per_trade
@@ -73,26 +315,66 @@ class RiskManager:
 
         if sl_distance == 0:
             logger.warning("Stop loss distance is zero, using minimum position size")
-            return 1
+            return PositionSizing(units=1, sl_distance=0.0, risk_amount=0.0)
 
         # Calculate position size
         # Risk amount = Position size * Stop loss distance
         position_size = int(risk_amount / sl_distance)
 
-        # Get instrument-specific config
-        instrument_config = self.config.get('instruments', {}).get(instrument, {})
-        min_size = instrument_config.get('min_trade_size', 1)
-        max_size = instrument_config.get('max_trade_size', 10000000)
-
-        # Ensure position size is within limits
-        position_size = max(min_size, min(position_size, max_size))
+        # Ensure position size is within instrument limits
+        limits = self._get_instrument_limits(instrument)
+        position_size = max(limits.min_trade_size, min(position_size, limits.max_trade_size))
 
         logger.info(
-            f"Position size calculated: {position_size} units "
-            f"(Risk: ${risk_amount:.2f}, SL Distance: {sl_distance:.5f})"
+            "Position size calculated: %d units (Risk: $%.2f, SL Distance: %.5f)",
+            position_size, risk_amount, sl_distance
         )
 
-        return position_size
+        return PositionSizing(
+            units=position_size,
+            sl_distance=sl_distance,
+            risk_amount=sl_distance * position_size
+        )
+
+    def calculate_position_size_batch(
+        self,
+        account_balance,
+        entry_prices,
+        stop_losses,
+        instruments: Sequence[str],
+        custom_risk: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Calculate position sizes for many trades at once (e.g. backtests).
+
+        Same sizing rules as calculate_position_size, without per-trade
+        logging.
+
+        Args:
+            account_balance: Balance per trade, or one balance for all
+            entry_prices: Entry price per trade
+            stop_losses: Stop loss price per trade
+            instruments: Instrument symbol per trade
+            custom_risk: Custom risk percentage (overrides default)
+
+        Returns:
+            int64 array of position sizes in units
+        """
+        risk_percent = custom_risk or self.risk_per_trade
+        limits = [self._get_instrument_limits(instrument) for instrument in instruments]
+        min_size = np.array([lim.min_trade_size for lim in limits], dtype=np.float64)
+        max_size = np.array([lim.max_trade_size for lim in limits], dtype=np.float64)
+
+        # Kernel expects equal-length contiguous float64 arrays
+        balance, entry, stop = np.broadcast_arrays(
+            account_balance, entry_prices, stop_losses, min_size
+        )[:3]
+        balance = np.ascontiguousarray(balance, dtype=np.float64)
+        entry = np.ascontiguousarray(entry, dtype=np.float64)
+        stop = np.ascontiguousarray(stop, dtype=np.float64)
+        risk_pct = np.full(entry.shape, risk_percent, dtype=np.float64)
+
+        return _position_size_batch(balance, entry, stop, min_size, max_size, risk_pct)
 
     def calculate_position_size_by_pips(
         self,
@@ -127,25 +409,43 @@ class RiskManager:
         position_size = int(risk_amount / (stop_loss_pips * pip_value))
 
         # Get instrument-specific limits
-        instrument_config = self.config.get('instruments', {}).get(instrument, {})
-        min_size = instrument_config.get('min_trade_size', 1)
-        max_size = instrument_config.get('max_trade_size', 10000000)
-
-        position_size = max(min_size, min(position_size, max_size))
+        limits = self._get_instrument_limits(instrument)
+        position_size = max(limits.min_trade_size, min(position_size, limits.max_trade_size))
 
         logger.info(
-            f"Position size by pips: {position_size} units "
-            f"(Risk: ${risk_amount:.2f}, SL: {stop_loss_pips} pips)"
+            "Position size by pips: %d units (Risk: $%.2f, SL: %s pips)",
+            position_size, risk_amount, stop_loss_pips
         )
 
         return position_size
 
+    def _get_thresholds(self, balance: float) -> tuple:
+        """
+        Convert the percentage limits to account currency for a balance.
+
+        Args:
+            balance: Current account balance (must be positive)
+
+        Returns:
+            Tuple of (balance, daily loss floor, weekly loss floor, max risk)
+        """
+        thresholds = self._thresholds
+        if thresholds[0] != balance:
+            thresholds = (
+                balance,
+                -self.daily_loss_limit * balance,
+                -self.weekly_loss_limit * balance,
+                self.max_total_risk * balance
+            )
+            self._thresholds = thresholds
+        return thresholds
+
     def can_open_position(
         self,
         current_positions: int,
         account_balance: float,
         proposed_risk: float
-    ) -> tuple[bool, str]:
+    ) -> tuple[bool, RiskRejectReason]:
         """
         Check if a new position can be opened.
 
@@ -155,36 +455,74 @@ class RiskManager:
             proposed_risk: Risk amount for the proposed trade
 
         Returns:
-            Tuple of (can_open, reason)
+            Tuple of (can_open, reason); use format_reject_reason for a
+            readable message
         """
         # Check if trading is enabled
         if not self.trading_enabled:
-            return False, "Trading is disabled due to risk limits"
+            return False, RiskRejectReason.DISABLED
 
         # Check maximum positions
         if current_positions >= self.max_positions:
-            return False, f"Maximum positions reached ({self.max_positions})"
+            return False, RiskRejectReason.MAX_POSITIONS
+
+        # Percentage limits can't be evaluated without a positive balance
+        if account_balance <= 0:
+            return True, RiskRejectReason.OK
+
+        # Compare against limits pre-scaled to the balance instead of
+        # dividing by it on every check
+        _, daily_thresh, weekly_thresh, total_risk_thresh = self._get_thresholds(account_balance)
+
+        # Read each counter once so a concurrent update can't change it mid-check
+        daily_pnl = self.daily_pnl
+        weekly_pnl = self.weekly_pnl
 
         # Check daily loss limit
-        daily_loss_percent = abs(self.daily_pnl) / account_balance if account_balance > 0 else 0
-        if self.daily_pnl < 0 and daily_loss_percent >= self.daily_loss_limit:
+        if daily_pnl < 0 and daily_pnl <= daily_thresh:
             if self.auto_disable_on_limit:
-                self.trading_enabled = False
-            return False, f"Daily loss limit reached ({self.daily_loss_limit * 100}%)"
+                with self._lock:
+                    self.trading_enabled = False
+                    self._version += 1
+                    self._save_state()
+            return False, RiskRejectReason.DAILY
 
         # Check weekly loss limit
-        weekly_loss_percent = abs(self.weekly_pnl) / account_balance if account_balance > 0 else 0
-        if self.weekly_pnl < 0 and weekly_loss_percent >= self.weekly_loss_limit:
+        if weekly_pnl < 0 and weekly_pnl <= weekly_thresh:
             if self.auto_disable_on_limit:
-                self.trading_enabled = False
-            return False, f"Weekly loss limit reached ({self.weekly_loss_limit * 100}%)"
+                with self._lock:
+                    self.trading_enabled = False
+                    self._version += 1
+                    self._save_state()
+            return False, RiskRejectReason.WEEKLY
 
         # Check total risk
-        current_risk_percent = proposed_risk / account_balance if account_balance > 0 else 0
-        if current_risk_percent > self.max_total_risk:
-            return False, f"Total risk limit exceeded ({self.max_total_risk * 100}%)"
+        if proposed_risk > total_risk_thresh:
+            return False, RiskRejectReason.TOTAL_RISK
 
-        return True, "OK"
+        return True, RiskRejectReason.OK
+
+    def format_reject_reason(self, reason: RiskRejectReason) -> str:
+        """
+        Describe a can_open_position result.
+
+        Args:
+            reason: Reason code
+
+        Returns:
+            Human-readable reason
+        """
+        if reason == RiskRejectReason.DISABLED:
+            return "Trading is disabled due to risk limits"
+        if reason == RiskRejectReason.MAX_POSITIONS:
+            return f"Maximum positions reached ({self.max_positions})"
+        if reason == RiskRejectReason.DAILY:
+            return f"Daily loss limit reached ({self.daily_loss_limit * 100}%)"
+        if reason == RiskRejectReason.WEEKLY:
+            return f"Weekly loss limit reached ({self.weekly_loss_limit * 100}%)"
+        if reason == RiskRejectReason.TOTAL_RISK:
+            return f"Total risk limit exceeded ({self.max_total_risk * 100}%)"
+        return "OK"
 
     def validate_trade(
         self,
@@ -207,39 +545,64 @@ class RiskManager:
         Returns:
             Tuple of (is_valid, reason)
         """
-        # Get instrument configuration
-        instrument_config = self.config.get('instruments', {}).get(instrument, {})
+        validator = self._validators.get(instrument)
+        if validator is None:
+            validator = _make_validator(instrument, self._get_instrument_limits(instrument))
+            self._validators[instrument] = validator
+        return validator(entry_price, stop_loss, take_profit, spread)
 
-        # Check if instrument is enabled
-        if not instrument_config.get('enabled', False):
-            return False, f"Instrument {instrument} is not enabled"
-
-        # Check spread
-        max_spread = instrument_config.get('max_spread')
-        if max_spread and spread and spread > max_spread:
-            return False, f"Spread too high: {spread} pips (max: {max_spread})"
-
-        # Validate stop loss
-        if stop_loss is not None:
-            if stop_loss == entry_price:
-                return False, "Stop loss cannot equal entry price"
+    def validate_trade_batch(
+        self,
+        instruments: Sequence[str],
+        entry_prices,
+        stop_losses,
+        take_profits,
+        spreads=None
+    ) -> np.ndarray:
+        """
+        Validate many candidate trades at once (e.g. strategy searches).
 
-        # Validate take profit
-        if take_profit is not None:
-            if take_profit == entry_price:
-                return False, "Take profit cannot equal entry price"
+        Same checks as validate_trade, without the reasons. Use NaN for a
+        missing stop loss, take profit or spread.
 
-        # Validate risk/reward ratio (optional)
-        if stop_loss and take_profit:
-            risk = abs(entry_price - stop_loss)
-            reward = abs(take_profit - entry_price)
-            rr_ratio = reward / risk if risk > 0 else 0
-
-            min_rr_ratio = instrument_config.get('min_risk_reward_ratio', 0)
-            if min_rr_ratio > 0 and rr_ratio < min_rr_ratio:
-                return False, f"Risk/reward ratio too low: {rr_ratio:.2f} (min: {min_rr_ratio})"
+        Args:
+            instruments: Instrument symbol per trade
+            entry_prices: Entry price per trade
+            stop_losses: Stop loss price per trade
+            take_profits: Take profit price per trade
+            spreads: Current spread per trade, or one spread for all
 
-        return True, "OK"
+        Returns:
+            Boolean array, True where the trade is valid
+        """
+        # Gather per-instrument limits from a table over the unique symbols
+        symbols, ids = np.unique(np.asarray(instruments, dtype=object), return_inverse=True)
+        limits = [self._get_instrument_limits(symbol) for symbol in symbols]
+        enabled = np.array([lim.enabled for lim in limits], dtype=bool)[ids]
+        # NaN switches a check off, as a falsy limit does in validate_trade
+        max_spread = np.array(
+            [lim.max_spread or np.nan for lim in limits], dtype=np.float64
+        )[ids]
+        min_rr = np.array([lim.min_risk_reward_ratio for lim in limits], dtype=np.float64)[ids]
+
+        entry = np.asarray(entry_prices, dtype=np.float64)
+        stop = np.asarray(stop_losses, dtype=np.float64)
+        target = np.asarray(take_profits, dtype=np.float64)
+        spread = np.asarray(np.nan if spreads is None else spreads, dtype=np.float64)
+
+        # reward / risk < min_rr, multiplied out; only checked when both
+        # SL and TP are set, matching validate_trade
+        risk = np.abs(entry - stop)
+        reward = np.abs(target - entry)
+        rr_too_low = (min_rr > 0) & (stop != 0) & (target != 0) & (reward < min_rr * risk)
+
+        return (
+            enabled
+            & ~(spread > max_spread)
+            & (stop != entry)
+            & (target != entry)
+            & ~rr_too_low
+        )
 
     def record_trade_result(self, pnl: float):
         """
@@ -248,27 +611,36 @@ class RiskManager:
         Args:
             pnl: Profit/loss from the trade
         """
-        # Reset daily PnL if needed
-        current_day = datetime.now().date()
-        if current_day != self.last_reset_day:
-            logger.info(f"Daily PnL reset. Previous: ${self.daily_pnl:.2f}")
-            self.daily_pnl = 0.0
-            self.last_reset_day = current_day
-
-        # Reset weekly PnL if needed
-        current_week = datetime.now().isocalendar()[1]
-        if current_week != self.last_reset_week:
-            logger.info(f"Weekly PnL reset. Previous: ${self.weekly_pnl:.2f}")
-            self.weekly_pnl = 0.0
-            self.last_reset_week = current_week
-
-        # Update PnL
-        self.daily_pnl += pnl
-        self.weekly_pnl += pnl
+        # One clock read so the day and week checks can't straddle midnight
+        now = datetime.now()
+
+        with self._lock:
+            # Reset daily PnL if needed
+            current_day = now.date()
+            if current_day != self.last_reset_day:
+                logger.info("Daily PnL reset. Previous: $%.2f", self.daily_pnl)
+                self.daily_pnl = 0.0
+                self.last_reset_day = current_day
+
+                # Reset weekly PnL if needed; the week can only change
+                # when the day does
+                current_week = now.isocalendar().week
+                if current_week != self.last_reset_week:
+                    logger.info("Weekly PnL reset. Previous: $%.2f", self.weekly_pnl)
+                    self.weekly_pnl = 0.0
+                    self.last_reset_week = current_week
+
+            # Update PnL
+            self.daily_pnl += pnl
+            self.weekly_pnl += pnl
+            daily_pnl = self.daily_pnl
+            weekly_pnl = self.weekly_pnl
+            self._version += 1
+            self._save_state()
 
         logger.info(
-            f"Trade result recorded: ${pnl:.2f} "
-            f"(Daily: ${self.daily_pnl:.2f}, Weekly: ${self.weekly_pnl:.2f})"
+            "Trade result recorded: $%.2f (Daily: $%.2f, Weekly: $%.2f)",
+            pnl, daily_pnl, weekly_pnl
         )
 
     def get_risk_status(self, account_balance: float) -> Dict[str, Any]:
@@ -279,12 +651,19 @@ class RiskManager:
             account_balance: Current account balance
 
         Returns:
-            Risk status information
+            Risk status information; the same dict is returned until the
+            state or balance changes, so callers must not modify it
         """
+        version = self._version
+        cached_version, cached_balance, cached_status = self._risk_status_cache
+        if (cached_version == version and cached_balance is not None
+                and abs(cached_balance - account_balance) < 1e-6):
+            return cached_status
+
         daily_loss_percent = abs(self.daily_pnl) / account_balance if account_balance > 0 else 0
         weekly_loss_percent = abs(self.weekly_pnl) / account_balance if account_balance > 0 else 0
 
-        return {
+        status = {
             'trading_enabled': self.trading_enabled,
             'daily_pnl': self.daily_pnl,
             'weekly_pnl': self.weekly_pnl,
@@ -295,20 +674,31 @@ class RiskManager:
             'daily_limit': self.daily_loss_limit,
             'weekly_limit': self.weekly_loss_limit
         }
+        self._risk_status_cache = (version, account_balance, status)
+        return status
 
     def enable_trading(self):
         """Enable trading."""
-        self.trading_enabled = True
+        with self._lock:
+            self.trading_enabled = True
+            self._version += 1
+            self._save_state()
         logger.info("Trading enabled")
 
     def disable_trading(self):
         """Disable trading."""
-        self.trading_enabled = False
+        with self._lock:
+            self.trading_enabled = False
+            self._version += 1
+            self._save_state()
         logger.warning("Trading disabled")
 
     def reset_limits(self):
         """Reset all risk limits (use with caution)."""
-        self.daily_pnl = 0.0
-        self.weekly_pnl = 0.0
-        self.trading_enabled = True
+        with self._lock:
+            self.daily_pnl = 0.0
+            self.weekly_pnl = 0.0
+            self.trading_enabled = True
+            self._version += 1
+            self._save_state()
         logger.warning("Risk limits have been reset")
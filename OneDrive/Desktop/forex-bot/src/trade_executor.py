@@ -1,19 +1,38 @@
 """
 Trade execution and management system.
 """
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Literal, Optional
 from datetime import datetime
 import logging
-from .oanda_client import OandaClient
+import requests
+from .oanda_client import OandaClient, OandaError, OandaErrorKind, count_open_positions
 from .risk_manager import RiskManager
 from .instrument_manager import InstrumentManager, get_instrument_manager
 
 logger = logging.getLogger(__name__)
 
+# Messages reported for order failures the bot recognises
+_ERROR_MESSAGES = {
+    OandaErrorKind.MARKET_HALTED: "Market is currently closed or halted",
+    OandaErrorKind.INSUFFICIENT_AUTH: "Insufficient authorization to trade",
+    OandaErrorKind.CLOSEOUT: "Order would trigger margin closeout",
+}
+
+
+@dataclass
+class _SignalContext:
+    """Market state fetched once per signal."""
+    instrument: str
+    pip_value: float
+    price_data: Dict[str, float]
+
 
 class TradeExecutor:
     """Executes and manages trades."""
 
+    __slots__ = ('oanda', 'risk_manager', 'instrument_manager')
+
     def __init__(
         self,
         oanda_client: OandaClient,
@@ -30,6 +49,11 @@ class TradeExecutor:
         """
         self.oanda = oanda_client
         self.risk_manager = risk_manager
+
+        # Each signal makes several OANDA calls; they should share one
+        # keep-alive session rather than handshake per request
+        if not isinstance(getattr(oanda_client, 'session', None), requests.Session):
+            logger.warning("OANDA client has no persistent HTTP session; connections won't be reused")
         self.instrument_manager = instrument_manager or get_instrument_manager()
 
         logger.info("Trade executor initialized")
@@ -48,165 +72,115 @@ class TradeExecutor:
             action = signal.get('action', '').lower()
             instrument = signal.get('instrument')
 
-            logger.info(f"Executing signal: {action} {instrument}")
+            logger.info("Executing signal: %s %s", action, instrument)
 
             if action == 'buy':
-                return self._execute_buy(signal)
+                return self._execute_buy(signal, self._build_context(instrument))
             elif action == 'sell':
-                return self._execute_sell(signal)
+                return self._execute_sell(signal, self._build_context(instrument))
             elif action == 'close':
                 return self._execute_close(signal)
             else:
-                logger.error(f"Unknown action: {action}")
+                logger.error("Unknown action: %s", action)
                 return {'status': 'error', 'message': f'Unknown action: {action}'}
 
         except Exception as e:
-            logger.error(f"Error executing signal: {e}")
+            logger.error("Error executing signal: %s", e)
             return {'status': 'error', 'message': str(e)}
 
-    def _execute_buy(self, signal: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a buy signal."""
-        instrument = signal['instrument']
-
-        # Normalize instrument symbol
-        instrument = self.instrument_manager.normalize_symbol(instrument)
-
-        # Get current price
-        price_data = self.oanda.get_current_price(instrument)
-        entry_price = price_data['ask']
-        spread = price_data['spread']
-
-        # Get stop loss and take profit
-        stop_loss = signal.get('stop_loss')
-        take_profit = signal.get('take_profit')
-
-        # Calculate SL/TP from pips if not provided
-        if stop_loss is None:
-            sl_pips = signal.get('sl_pips', 20)
-            sl_price = self.instrument_manager.calculate_price_from_pips(instrument, sl_pips)
-            stop_loss = entry_price - sl_price
-
-        if take_profit is None:
-            tp_pips = signal.get('tp_pips', 40)
-            tp_price = self.instrument_manager.calculate_price_from_pips(instrument, tp_pips)
-            take_profit = entry_price + tp_price
-
-        # Validate the trade
-        is_valid, reason = self.risk_manager.validate_trade(
-            instrument=instrument,
-            entry_price=entry_price,
-            stop_loss=stop_loss,
-            take_profit=take_profit,
-            spread=spread
-        )
+    def _build_context(self, instrument: str) -> _SignalContext:
+        """
+        Fetch the price a signal needs.
 
-        if not is_valid:
-            logger.warning(f"Trade validation failed: {reason}")
-            return {'status': 'rejected', 'message': reason}
+        Account state is fetched separately, once the trade has passed
+        validation, so rejected signals cost only the price request.
 
-        # Get account balance
-        account_balance = self.oanda.get_account_balance()
+        Args:
+            instrument: Instrument symbol (any supported format)
 
-        # Calculate position size
-        position_size = self.risk_manager.calculate_position_size(
-            account_balance=account_balance,
-            entry_price=entry_price,
-            stop_loss=stop_loss,
+        Returns:
+            Signal context
+        """
+        instrument = self.instrument_manager.normalize_symbol(instrument)
+        return _SignalContext(
             instrument=instrument,
-            pip_value=self.instrument_manager.get_pip_value(instrument)
+            pip_value=self.instrument_manager.get_pip_value(instrument),
+            price_data=self.oanda.get_current_price(instrument)
         )
 
-        # Check if we can open the position
-        current_positions = self.oanda.get_position_count()
-        risk_amount = abs(entry_price - stop_loss) * position_size
-
-        can_open, reason = self.risk_manager.can_open_position(
-            current_positions=current_positions,
-            account_balance=account_balance,
-            proposed_risk=risk_amount
-        )
+    def _get_account_state(self) -> tuple[float, int]:
+        """
+        Fetch the balance and open position count.
 
-        if not can_open:
-            logger.warning(f"Cannot open position: {reason}")
-            return {'status': 'rejected', 'message': reason}
+        Both come from one account details request rather than separate
+        balance and positions calls.
 
-        # Place the order
-        logger.info(
-            f"Placing BUY order: {instrument} {position_size} units @ {entry_price:.5f} "
-            f"SL: {stop_loss:.5f} TP: {take_profit:.5f}"
+        Returns:
+            Tuple of (account_balance, current_positions)
+        """
+        account = self.oanda.get_account_details()
+        return (
+            float(account.get('balance', 0)),
+            count_open_positions(account.get('positions', []))
         )
 
-        try:
-            response = self.oanda.place_market_order(
-                instrument=instrument,
-                units=position_size,
-                stop_loss=stop_loss,
-                take_profit=take_profit
-            )
-
-            # Extract trade ID if available
-            trade_id = None
-            if 'orderFillTransaction' in response:
-                trade_id = response['orderFillTransaction'].get('id')
-            elif 'orderCreateTransaction' in response:
-                trade_id = response['orderCreateTransaction'].get('id')
-
-            return {
-                'status': 'success',
-                'action': 'buy',
-                'instrument': instrument,
-                'units': position_size,
-                'entry_price': entry_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'trade_id': trade_id,
-                'response': response
-            }
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"OANDA order failed: {error_msg}")
+    def _execute_buy(
+        self,
+        signal: Dict[str, Any],
+        context: Optional[_SignalContext] = None
+    ) -> Dict[str, Any]:
+        """Execute a buy signal."""
+        return self._execute_directional(signal, 1, context)
 
-            # Parse OANDA error message for common issues
-            if 'MARKET_HALTED' in error_msg or 'market is not tradeable' in error_msg:
-                error_msg = "Market is currently closed or halted"
-            elif 'Insufficient authorization' in error_msg:
-                error_msg = "Insufficient authorization to trade"
-            elif 'closeout' in error_msg.lower():
-                error_msg = "Order would trigger margin closeout"
+    def _execute_sell(
+        self,
+        signal: Dict[str, Any],
+        context: Optional[_SignalContext] = None
+    ) -> Dict[str, Any]:
+        """Execute a sell signal."""
+        return self._execute_directional(signal, -1, context)
 
-            return {
-                'status': 'error',
-                'message': error_msg,
-                'action': 'buy',
-                'instrument': instrument
-            }
+    def _execute_directional(
+        self,
+        signal: Dict[str, Any],
+        direction: Literal[1, -1],
+        context: Optional[_SignalContext] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute a buy (direction 1) or sell (direction -1) signal.
 
-    def _execute_sell(self, signal: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a sell signal."""
-        instrument = signal['instrument']
+        Args:
+            signal: Trading signal
+            direction: 1 for buy, -1 for sell
+            context: Pre-fetched price state
 
-        # Normalize instrument symbol
-        instrument = self.instrument_manager.normalize_symbol(instrument)
+        Returns:
+            Execution result
+        """
+        action = 'buy' if direction > 0 else 'sell'
+        context = context or self._build_context(signal['instrument'])
+        instrument = context.instrument
 
-        # Get current price
-        price_data = self.oanda.get_current_price(instrument)
-        entry_price = price_data['bid']
+        # Current price: buys fill at the ask, sells at the bid
+        price_data = context.price_data
+        entry_price = price_data['ask' if direction > 0 else 'bid']
         spread = price_data['spread']
 
         # Get stop loss and take profit
         stop_loss = signal.get('stop_loss')
         take_profit = signal.get('take_profit')
 
-        # Calculate SL/TP from pips if not provided
+        # Calculate SL/TP from pips if not provided (SL below entry for
+        # buys and above for sells, TP the other way round)
         if stop_loss is None:
             sl_pips = signal.get('sl_pips', 20)
-            sl_price = self.instrument_manager.calculate_price_from_pips(instrument, sl_pips)
-            stop_loss = entry_price + sl_price
+            sl_price = sl_pips * context.pip_value
+            stop_loss = entry_price - direction * sl_price
 
         if take_profit is None:
             tp_pips = signal.get('tp_pips', 40)
-            tp_price = self.instrument_manager.calculate_price_from_pips(instrument, tp_pips)
-            take_profit = entry_price - tp_price
+            tp_price = tp_pips * context.pip_value
+            take_profit = entry_price + direction * tp_price
 
         # Validate the trade
         is_valid, reason = self.risk_manager.validate_trade(
@@ -218,24 +192,24 @@ class TradeExecutor:
         )
 
         if not is_valid:
-            logger.warning(f"Trade validation failed: {reason}")
+            logger.warning("Trade validation failed: %s", reason)
             return {'status': 'rejected', 'message': reason}
 
-        # Get account balance
-        account_balance = self.oanda.get_account_balance()
+        # Account balance and open positions
+        account_balance, current_positions = self._get_account_state()
 
-        # Calculate position size (negative for sell)
-        position_size = self.risk_manager.calculate_position_size(
+        # Calculate position size
+        sizing = self.risk_manager.calculate_position_size(
             account_balance=account_balance,
             entry_price=entry_price,
             stop_loss=stop_loss,
             instrument=instrument,
-            pip_value=self.instrument_manager.get_pip_value(instrument)
+            pip_value=context.pip_value
         )
+        position_size = sizing.units
 
         # Check if we can open the position
-        current_positions = self.oanda.get_position_count()
-        risk_amount = abs(entry_price - stop_loss) * position_size
+        risk_amount = sizing.risk_amount
 
         can_open, reason = self.risk_manager.can_open_position(
             current_positions=current_positions,
@@ -244,60 +218,52 @@ class TradeExecutor:
         )
 
         if not can_open:
-            logger.warning(f"Cannot open position: {reason}")
-            return {'status': 'rejected', 'message': reason}
+            message = self.risk_manager.format_reject_reason(reason)
+            logger.warning("Cannot open position: %s", message)
+            return {'status': 'rejected', 'message': message}
 
         # Place the order (negative units for sell)
         logger.info(
-            f"Placing SELL order: {instrument} {position_size} units @ {entry_price:.5f} "
-            f"SL: {stop_loss:.5f} TP: {take_profit:.5f}"
+            "Placing %s order: %s %d units @ %.5f SL: %.5f TP: %.5f",
+            action.upper(), instrument, position_size, entry_price, stop_loss, take_profit
         )
+        units = direction * position_size
 
-        try:
-            response = self.oanda.place_market_order(
-                instrument=instrument,
-                units=-position_size,  # Negative for sell
-                stop_loss=stop_loss,
-                take_profit=take_profit
-            )
-
-            # Extract trade ID if available
-            trade_id = None
-            if 'orderFillTransaction' in response:
-                trade_id = response['orderFillTransaction'].get('id')
-            elif 'orderCreateTransaction' in response:
-                trade_id = response['orderCreateTransaction'].get('id')
-
-            return {
-                'status': 'success',
-                'action': 'sell',
-                'instrument': instrument,
-                'units': -position_size,
-                'entry_price': entry_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'trade_id': trade_id,
-                'response': response
-            }
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"OANDA order failed: {error_msg}")
-
-            # Parse OANDA error message for common issues
-            if 'MARKET_HALTED' in error_msg or 'market is not tradeable' in error_msg:
-                error_msg = "Market is currently closed or halted"
-            elif 'Insufficient authorization' in error_msg:
-                error_msg = "Insufficient authorization to trade"
-            elif 'closeout' in error_msg.lower():
-                error_msg = "Order would trigger margin closeout"
+        response = self.oanda.place_market_order(
+            instrument=instrument,
+            units=units,
+            stop_loss=stop_loss,
+            take_profit=take_profit
+        )
 
+        if isinstance(response, OandaError):
+            logger.error("OANDA order failed: %s", response.message)
             return {
                 'status': 'error',
-                'message': error_msg,
-                'action': 'sell',
+                'message': _ERROR_MESSAGES.get(response.kind, response.message),
+                'action': action,
                 'instrument': instrument
             }
 
+        # Extract trade ID if available
+        trade_id = None
+        if 'orderFillTransaction' in response:
+            trade_id = response['orderFillTransaction'].get('id')
+        elif 'orderCreateTransaction' in response:
+            trade_id = response['orderCreateTransaction'].get('id')
+
+        return {
+            'status': 'success',
+            'action': action,
+            'instrument': instrument,
+            'units': units,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'trade_id': trade_id,
+            'response': response
+        }
+
     def _execute_close(self, signal: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a close signal."""
         instrument = signal['instrument']
@@ -305,7 +271,7 @@ class TradeExecutor:
         # Normalize instrument symbol
         instrument = self.instrument_manager.normalize_symbol(instrument)
 
-        logger.info(f"Closing position: {instrument}")
+        logger.info("Closing position: %s", instrument)
 
         try:
             response = self.oanda.close_position(instrument)
@@ -316,7 +282,7 @@ class TradeExecutor:
                 'response': response
             }
         except Exception as e:
-            logger.error(f"Error closing position: {e}")
+            logger.error("Error closing position: %s", e)
             return {
                 'status': 'error',
                 'action': 'close',
@@ -355,8 +321,8 @@ class TradeExecutor:
                 stop_loss=stop_loss,
                 take_profit=take_profit
             )
-            logger.info(f"Trade {trade_id} modified")
+            logger.info("Trade %s modified", trade_id)
             return {'status': 'success', 'response': response}
         except Exception as e:
-            logger.error(f"Error modifying trade: {e}")
+            logger.error("Error modifying trade: %s", e)
             return {'status': 'error', 'message': str(e)}
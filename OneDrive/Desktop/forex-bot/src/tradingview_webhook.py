@@ -1,15 +1,89 @@
 """
 TradingView webhook receiver for processing trading signals.
 """
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-from typing import Dict, Any, Optional, Callable
+from flask import Flask, Blueprint, g, request, jsonify
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
+from waitress.server import MultiSocketServer, create_server
+from .json_provider import OrjsonProvider
+from importlib.metadata import version
+from typing import Dict, Any, Optional, Callable, Union
 import logging
-import hashlib
+import orjson
 import hmac
+import ipaddress
+import ssl
+import threading
 
 logger = logging.getLogger(__name__)
 
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+MAC_ALGORITHMS = ('sha256', 'blake2b')
+
+
+def cpu_has_sha_extensions() -> Optional[bool]:
+    """
+    Check whether the CPU advertises SHA-256 instructions.
+
+    Reads the x86 'sha_ni' or ARM 'sha2' flag from /proc/cpuinfo. OpenSSL
+    uses these automatically when present.
+
+    Returns:
+        True/False, or None if it can't be determined (e.g. not Linux)
+    """
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key.strip() in ('flags', 'Features'):
+                    flags = value.split()
+                    return 'sha_ni' in flags or 'sha2' in flags
+    except OSError:
+        return None
+    return None
+
+
+class TradingSignal(BaseModel):
+    """Trading signal sent by a TradingView alert, normalized on validation."""
+
+    action: str
+    instrument: str
+    price: Optional[float] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    quantity: Optional[float] = None
+    strategy: Optional[str] = 'unknown'
+    timestamp: Any = None
+
+    @model_validator(mode='before')
+    @classmethod
+    def _resolve_sl_tp(cls, data: Any) -> Any:
+        # Alerts send either sl/tp or stop_loss/take_profit; a null short
+        # key falls back to the long one
+        if isinstance(data, dict):
+            data = dict(data)
+            data['stop_loss'] = data.get('sl') or data.get('stop_loss')
+            data['take_profit'] = data.get('tp') or data.get('take_profit')
+        return data
+
+    @field_validator('action')
+    @classmethod
+    def _lower_action(cls, value: str) -> str:
+        return value.lower()
+
+    @field_validator('instrument')
+    @classmethod
+    def _normalize_instrument(cls, value: str) -> str:
+        # Convert EUR/USD to EUR_USD; most alerts already use OANDA's form
+        if '/' in value:
+            return value.replace('/', '_')
+        return value
+
+    @field_validator('strategy')
+    @classmethod
+    def _default_strategy(cls, value: Optional[str]) -> str:
+        return 'unknown' if value is None else value
+
 
 class TradingViewWebhook:
     """Webhook server for receiving TradingView alerts."""
@@ -18,7 +92,11 @@ class TradingViewWebhook:
         self,
         port: int = 5000,
         webhook_secret: Optional[str] = None,
-        allowed_ips: Optional[list] = None
+        allowed_ips: Optional[list] = None,
+        threads: int = 4,
+        include_raw_data: bool = False,
+        require_signature_header: bool = False,
+        mac_algorithm: str = 'sha256'
     ):
         """
         Initialize webhook server.
@@ -26,64 +104,185 @@ class TradingViewWebhook:
         Args:
             port: Port to run webhook server on
             webhook_secret: Secret key for validating webhooks
-            allowed_ips: List of allowed IP addresses (None = allow all)
+            allowed_ips: List of allowed IP addresses or CIDR ranges (None = allow all)
+            threads: Server worker threads, i.e. webhooks handled concurrently
+            include_raw_data: Attach the original payload to each signal's
+                metadata as 'raw_data'
+            require_signature_header: Only accept requests signed with an
+                X-Signature header, so every unauthenticated request is
+                rejected before its body is parsed
+            mac_algorithm: Hash used for signature HMACs, 'sha256' or
+                'blake2b' (faster on CPUs without SHA instructions; senders
+                must sign with the same algorithm)
         """
+        if mac_algorithm not in MAC_ALGORITHMS:
+            raise ValueError(f"Unsupported mac_algorithm: {mac_algorithm}")
+
         self.port = port
+        self.threads = threads
+        self.include_raw_data = include_raw_data
+        self.require_signature_header = require_signature_header
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # Guards _server between run() and shutdown()
+        self._server_lock = threading.Lock()
         self.webhook_secret = webhook_secret
-        self.allowed_ips = allowed_ips or []
+        self.mac_algorithm = mac_algorithm
+        # Keyed HMAC state, copied per request so the key padding and its
+        # first hash block are only processed once
+        self._hmac_template = (
+            hmac.new(webhook_secret.encode(), digestmod=mac_algorithm) if webhook_secret else None
+        )
+        # Exact addresses are checked with one set lookup; CIDR ranges only
+        # when that misses
+        allowed_ips = allowed_ips or []
+        self.allowed_ips = frozenset(
+            ipaddress.ip_address(ip) for ip in allowed_ips if '/' not in ip
+        )
+        self._allowed_networks = tuple(
+            ipaddress.ip_network(ip, strict=False) for ip in allowed_ips if '/' in ip
+        )
+        self._restrict_ips = bool(allowed_ips)
         self.signal_handler: Optional[Callable] = None
 
-        # Initialize Flask app
-        self.app = Flask(__name__)
-        CORS(self.app)
-
-        # Register routes
+        # Routes live on a blueprint so they can be mounted on another app
+        self.blueprint = Blueprint('tradingview', __name__)
         self._register_routes()
 
-        logger.info(f"TradingView webhook initialized on port {port}")
+        # Standalone Flask app for running the webhook on its own port
+        self.app = Flask(__name__)
+        self.app.json = OrjsonProvider(self.app)
+        self.app.register_blueprint(self.blueprint)
+
+        logger.info("TradingView webhook initialized on port %s", port)
+        if webhook_secret:
+            # HMAC runs in OpenSSL, which picks SHA-NI/ARMv8 SHA
+            # instructions at runtime where the CPU has them
+            sha_extensions = cpu_has_sha_extensions()
+            logger.info(
+                "Webhook signatures use HMAC-%s via %s (CPU SHA extensions: %s)",
+                mac_algorithm.upper(), ssl.OPENSSL_VERSION, sha_extensions
+            )
+            if mac_algorithm == 'sha256' and sha_extensions is False:
+                logger.warning(
+                    "CPU has no SHA-256 instructions; HMAC-SHA256 runs in software. "
+                    "mac_algorithm='blake2b' is faster on this machine"
+                )
 
     def _register_routes(self):
-        """Register Flask routes."""
+        """Register Flask routes on the webhook blueprint."""
+
+        @self.blueprint.before_request
+        def resolve_remote_ip():
+            """Parse the client address once per request for the IP check."""
+            if not self._restrict_ips:
+                return
+            # The socket peer (REMOTE_ADDR) only: X-Forwarded-For is set by
+            # the client and would let anyone pass the whitelist
+            try:
+                g.remote_ip = ipaddress.ip_address(request.remote_addr)
+            except ValueError:
+                g.remote_ip = None
 
-        @self.app.route('/webhook', methods=['POST'])
+        @self.blueprint.route('/webhook', methods=['POST'])
         def webhook():
             """Handle incoming webhook requests."""
             try:
                 # Check IP whitelist
-                if self.allowed_ips and request.remote_addr not in self.allowed_ips:
-                    logger.warning(f"Rejected webhook from {request.remote_addr}")
+                if self._restrict_ips and not self._is_ip_allowed(g.remote_ip):
+                    logger.warning("Rejected webhook from %s", request.remote_addr)
                     return jsonify({'error': 'Unauthorized IP'}), 403
 
-                # Get webhook data
-                data = request.get_json()
+                # Parse the body directly with orjson; TradingView alerts
+                # aren't always sent with a JSON content type
+                body = request.get_data(cache=False)
+                if not body:
+                    return jsonify({'error': 'No data provided'}), 400
+
+                # A signature header covers the raw body, so forged requests
+                # are rejected before any parsing
+                header_signature = request.headers.get('X-Signature')
+                if self.webhook_secret:
+                    if header_signature is None:
+                        if self.require_signature_header:
+                            logger.warning("Rejected unsigned webhook")
+                            return jsonify({'error': 'Missing signature'}), 401
+                    elif not self._validate_body_signature(body, header_signature):
+                        logger.warning("Invalid webhook signature")
+                        return jsonify({'error': 'Invalid signature'}), 401
+
+                try:
+                    data = orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    logger.warning("Rejected webhook with invalid JSON body")
+                    return jsonify({'error': 'Invalid JSON'}), 400
 
                 if not data:
                     return jsonify({'error': 'No data provided'}), 400
 
-                # Validate webhook signature if secret is set
-                if self.webhook_secret:
+                # Fall back to the in-body signature if no header was sent
+                if self.webhook_secret and header_signature is None:
                     if not self._validate_signature(data):
                         logger.warning("Invalid webhook signature")
                         return jsonify({'error': 'Invalid signature'}), 401
 
                 # Process the signal
-                logger.info(f"Received webhook: {data}")
-                result = self._process_signal(data)
+                logger.info("Received webhook: %s", data)
+                try:
+                    result = self._process_signal(data)
+                except ValidationError as e:
+                    logger.warning("Rejected invalid signal: %s", e)
+                    details = e.errors(include_url=False, include_context=False, include_input=False)
+                    return jsonify({'error': 'Invalid signal', 'details': details}), 400
 
                 return jsonify({'status': 'success', 'result': result}), 200
 
             except Exception as e:
-                logger.error(f"Error processing webhook: {e}")
+                logger.exception("Error processing webhook: %s", e)
                 return jsonify({'error': str(e)}), 500
 
-        @self.app.route('/health', methods=['GET'])
+        @self.blueprint.route('/health', methods=['GET'])
         def health():
             """Health check endpoint."""
             return jsonify({'status': 'healthy'}), 200
 
+    def _is_ip_allowed(self, address: Optional[IPAddress]) -> bool:
+        """
+        Check a client address against the IP whitelist.
+
+        Args:
+            address: Parsed client IP address (None if it couldn't be parsed)
+
+        Returns:
+            True if the address is whitelisted
+        """
+        if address is None:
+            return False
+        if address in self.allowed_ips:
+            return True
+        return any(address in network for network in self._allowed_networks)
+
+    def _validate_body_signature(self, body: bytes, signature: str) -> bool:
+        """
+        Validate an X-Signature header against the raw request body.
+
+        TradingView can't add headers to alerts, so this is for senders
+        (or a reverse proxy in front of the bot) that sign the body
+        themselves.
+
+        Args:
+            body: Raw request body
+            signature: Hex HMAC of the body
+
+        Returns:
+            True if signature is valid
+        """
+        return self._signature_matches(body, signature)
+
     def _validate_signature(self, data: Dict[str, Any]) -> bool:
         """
-        Validate webhook signature.
+        Validate the legacy in-body signature over timestamp + action.
 
         Args:
             data: Webhook data
@@ -100,13 +299,30 @@ class TradingViewWebhook:
 
         # Create expected signature
         payload = str(data.get('timestamp', '')) + str(data.get('action', ''))
-        expected_signature = hmac.new(
-            self.webhook_secret.encode(),
-            payload.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        return self._signature_matches(payload.encode(), signature)
+
+    def _signature_matches(self, payload: bytes, signature: Any) -> bool:
+        """
+        Check a hex signature against the HMAC of a payload.
+
+        The provided hex is decoded once and compared with the raw digest,
+        rather than hex-encoding the digest for every check.
+
+        Args:
+            payload: Signed bytes
+            signature: Hex signature sent by the client
+
+        Returns:
+            True if signature is valid
+        """
+        try:
+            provided = bytes.fromhex(signature)
+        except (TypeError, ValueError):
+            return False
 
-        return hmac.compare_digest(signature, expected_signature)
+        mac = self._hmac_template.copy()
+        mac.update(payload)
+        return hmac.compare_digest(provided, mac.digest())
 
     def _process_signal(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -130,28 +346,17 @@ class TradingViewWebhook:
 
         Returns:
             Processing result
+
+        Raises:
+            ValidationError: If required fields are missing or have the wrong type
         """
-        # Validate required fields
-        required_fields = ['action', 'instrument']
-        for field in required_fields:
-            if field not in data:
-                raise ValueError(f"Missing required field: {field}")
-
-        # Normalize the signal
-        signal = {
-            'action': data['action'].lower(),
-            'instrument': data['instrument'].replace('/', '_'),  # Convert EUR/USD to EUR_USD
-            'price': data.get('price'),
-            'stop_loss': data.get('sl') or data.get('stop_loss'),
-            'take_profit': data.get('tp') or data.get('take_profit'),
-            'quantity': data.get('quantity'),
-            'strategy': data.get('strategy', 'unknown'),
-            'timestamp': data.get('timestamp'),
-            'metadata': {
-                'source': 'tradingview',
-                'raw_data': data
-            }
-        }
+        # Validate and normalize the signal in one pass
+        signal = TradingSignal.model_validate(data).model_dump()
+        # The raw payload keeps the parsed JSON alive for as long as the
+        # signal is stored, so it's only attached on request
+        signal['metadata'] = {'source': 'tradingview'}
+        if self.include_raw_data:
+            signal['metadata']['raw_data'] = data
 
         # Call the signal handler if registered
         if self.signal_handler:
@@ -159,7 +364,7 @@ class TradingViewWebhook:
                 result = self.signal_handler(signal)
                 return result
             except Exception as e:
-                logger.error(f"Error in signal handler: {e}")
+                logger.error("Error in signal handler: %s", e)
                 raise
         else:
             logger.warning("No signal handler registered")
@@ -179,28 +384,109 @@ class TradingViewWebhook:
         """
         Start the webhook server.
 
+        Serves on waitress, a multi-threaded production WSGI server; the
+        Flask development server is only used in debug mode.
+
+        Args:
+            debug: Run on the Flask development server with debug mode
+        """
+        logger.info("Starting webhook server on port %s", self.port)
+        if debug:
+            self.app.run(host='0.0.0.0', port=self.port, debug=True)
+            return
+
+        # poll() instead of select(): no FD_SETSIZE cap on open
+        # connections and no rebuilding fd sets on every loop
+        server = create_server(
+            self.app, host='0.0.0.0', port=self.port, threads=self.threads,
+            asyncore_use_poll=True
+        )
+        with self._server_lock:
+            if self._stopping.is_set():
+                # shutdown() ran while the server was being created
+                server.task_dispatcher.shutdown()
+                server.close()
+                return
+            self._server = server
+        adj = server.adj
+        logger.info(
+            "Webhook server: waitress %s, %d threads, %s() socket loop, %d connection limit",
+            version('waitress'), adj.threads, 'poll' if adj.asyncore_use_poll else 'select',
+            adj.connection_limit
+        )
+        server.print_listen("Serving on http://{}:{}")
+        server.run()
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Stop a server started with run() or run_async().
+
+        Stops the worker threads and closes the listening socket and any
+        open (e.g. idle keep-alive) connections, which ends the server loop.
+
         Args:
-            debug: Enable Flask debug mode
+            timeout: Seconds to wait for the background thread to exit
         """
-        logger.info(f"Starting webhook server on port {self.port}")
-        self.app.run(host='0.0.0.0', port=self.port, debug=debug)
+        with self._server_lock:
+            self._stopping.set()
+            server, self._server = self._server, None
+        if isinstance(server, MultiSocketServer):
+            # Stops the dispatcher and closes every socket in its map
+            server.close()
+        elif server is not None:
+            # Let in-flight requests finish before their sockets go away
+            server.task_dispatcher.shutdown()
+            server.close()
+            # Connections left open would keep the loop alive, with no
+            # workers left to answer them
+            for channel in list(server._map.values()):
+                channel.close()
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        logger.info("Webhook server stopped")
 
     def run_async(self):
-        """Run webhook server in a separate thread."""
-        from threading import Thread
-        thread = Thread(target=self.run, daemon=True)
-        thread.start()
-        logger.info("Webhook server started in background thread")
+        """
+        Run webhook server in a supervised background thread; see shutdown().
 
+        Raises:
+            RuntimeError: If a previous server thread is still running
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Webhook server thread is already running")
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._supervised_run,
+            name='tradingview-webhook',
+            daemon=True
+        )
+        self._thread.start()
+        logger.info("Webhook server started in background thread")
 
-def create_tradingview_alert_template() -> str:
-    """
-    Generate a template for TradingView alert messages.
+    def _supervised_run(self, max_backoff: float = 60.0):
+        """
+        Run the webhook server, restarting it if it crashes.
 
-    Returns:
-        JSON template string for TradingView alerts
-    """
-    template = '''{
+        Args:
+            max_backoff: Maximum delay in seconds between restarts
+        """
+        delay = 1.0
+        while not self._stopping.is_set():
+            try:
+                self.run()
+                return
+            except Exception:
+                if self._stopping.is_set():
+                    return
+                logger.error("Webhook server crashed, restarting in %.0fs", delay, exc_info=True)
+                if self._stopping.wait(delay):
+                    return
+                delay = min(delay * 2, max_backoff)
+
+
+# Alert message template, built once at import time
+_ALERT_TEMPLATE = '''{
     "action": "{{strategy.order.action}}",
     "instrument": "{{ticker}}",
     "price": {{close}},
@@ -211,7 +497,16 @@ def create_tradingview_alert_template() -> str:
     "timestamp": {{timenow}},
     "signature": "your_signature_here"
 }'''
-    return template
+
+
+def create_tradingview_alert_template() -> str:
+    """
+    Generate a template for TradingView alert messages.
+
+    Returns:
+        JSON template string for TradingView alerts
+    """
+    return _ALERT_TEMPLATE
 
 
 # Example usage
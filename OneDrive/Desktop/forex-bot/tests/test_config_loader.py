@@ -0,0 +1,43 @@
+"""
+Tests for config loading and dotted-key lookups.
+"""
+import pytest
+
+from src.config_loader import ConfigLoader
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    for name in ('OANDA_ACCOUNT_ID', 'OANDA_API_KEY', 'OANDA_ENVIRONMENT',
+                 'TRADINGVIEW_WEBHOOK_SECRET'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.chdir(tmp_path)  # no .env picked up from the working directory
+    path = tmp_path / 'config.yaml'
+    path.write_text(
+        "oanda:\n"
+        "  environment: practice\n"
+        "  account_id: null\n"
+        "trading:\n"
+        "  trailing_stop:\n"
+        "    enabled: false\n"
+    )
+    return ConfigLoader(str(path))
+
+
+def test_sections_and_leaves_resolve(config):
+    assert config.get('oanda') == {'environment': 'practice', 'account_id': None}
+    assert config.get('oanda.environment') == 'practice'
+    assert config.get('trading.trailing_stop.enabled') is False
+
+
+def test_missing_and_null_keys_use_default(config):
+    assert config.get('oanda.account_id', 'fallback') == 'fallback'
+    assert config.get('trading.missing', 3) == 3
+
+
+def test_env_variables_override_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('OANDA_ACCOUNT_ID', '101-001')
+    path = tmp_path / 'config.yaml'
+    path.write_text("oanda:\n  account_id: from-file\n")
+    assert ConfigLoader(str(path)).get('oanda.account_id') == '101-001'
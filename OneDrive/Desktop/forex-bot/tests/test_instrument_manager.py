@@ -0,0 +1,29 @@
+"""
+Tests for the batch pip helpers.
+"""
+import numpy as np
+
+from src.instrument_manager import get_instrument_manager
+
+
+SYMBOLS = ['EUR_USD', 'USD_JPY', 'GBP_USD']
+
+
+def test_pips_batch_matches_scalar():
+    manager = get_instrument_manager()
+    diffs = [0.0012, -0.35, 0.0]
+    expected = [manager.calculate_pips(s, d) for s, d in zip(SYMBOLS, diffs)]
+    np.testing.assert_allclose(manager.calculate_pips_batch(SYMBOLS, diffs), expected)
+
+
+def test_price_from_pips_batch_matches_scalar():
+    manager = get_instrument_manager()
+    pips = [20.0, 15.0, 7.5]
+    expected = [manager.calculate_price_from_pips(s, p) for s, p in zip(SYMBOLS, pips)]
+    np.testing.assert_allclose(manager.calculate_price_from_pips_batch(SYMBOLS, pips), expected)
+
+
+def test_batch_keeps_float32():
+    manager = get_instrument_manager()
+    diffs = np.array([0.001, 0.5, 0.002], dtype=np.float32)
+    assert manager.calculate_pips_batch(SYMBOLS, diffs).dtype == np.float32
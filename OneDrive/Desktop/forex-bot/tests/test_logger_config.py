@@ -0,0 +1,58 @@
+"""
+Tests for the queued file logging setup.
+"""
+import logging
+import threading
+
+from src.logger_config import setup_logger, stop_logging
+
+
+def test_second_logger_keeps_first_logger_writing(tmp_path):
+    first = setup_logger('first', log_dir=str(tmp_path))
+    second = setup_logger('second', log_dir=str(tmp_path))
+    try:
+        first.info("from first")
+        second.info("from second")
+    finally:
+        stop_logging()
+
+    assert 'from first' in (tmp_path / 'first.log').read_text()
+    assert 'from second' in (tmp_path / 'second.log').read_text()
+
+
+def test_reconfiguring_a_logger_replaces_its_listener(tmp_path):
+    logger = setup_logger('reconfigured', log_dir=str(tmp_path))
+    logger.info("before")
+    logger = setup_logger('reconfigured', log_dir=str(tmp_path))
+    try:
+        logger.info("after")
+    finally:
+        stop_logging()
+
+    lines = (tmp_path / 'reconfigured.log').read_text().splitlines()
+    assert [line.rsplit(' - ', 1)[1] for line in lines] == ['before', 'after']
+
+
+def test_tracebacks_are_formatted_on_the_listener_thread(tmp_path, monkeypatch):
+    formatting_threads = []
+    original = logging.Formatter.formatException
+
+    def recording_format_exception(self, ei):
+        formatting_threads.append(threading.current_thread())
+        return original(self, ei)
+
+    monkeypatch.setattr(logging.Formatter, 'formatException', recording_format_exception)
+    logger = setup_logger('tracebacks', log_dir=str(tmp_path))
+    # pytest's log capture hooks the root logger; the app configures none
+    monkeypatch.setattr(logger, 'propagate', False)
+    try:
+        try:
+            raise ValueError("order rejected")
+        except ValueError as e:
+            logger.exception("Error handling signal: %r", e)
+    finally:
+        stop_logging()
+
+    assert formatting_threads
+    assert threading.current_thread() not in formatting_threads
+    assert 'Traceback' in (tmp_path / 'tracebacks_errors.log').read_text()
@@ -0,0 +1,44 @@
+"""
+Tests for the OANDA pricing stream.
+"""
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from src.oanda_client import OandaClient
+
+
+def _client():
+    return OandaClient(account_id='001-001-1234567-001', api_key='test-token')
+
+
+def test_stream_client_has_a_read_timeout():
+    client = _client()
+    assert client._stream_client.request_params == {'timeout': OandaClient.STREAM_READ_TIMEOUT}
+    # REST calls keep the shared session without a stream timeout
+    assert client.client.request_params == {}
+
+
+def test_stream_reconnects_after_a_read_timeout(monkeypatch):
+    client = _client()
+    calls = []
+
+    def fake_request(endpoint):
+        calls.append(endpoint)
+        if len(calls) == 1:
+            raise requests.exceptions.ConnectionError(
+                ReadTimeoutError(None, None, "Read timed out.")
+            )
+        yield {
+            'type': 'PRICE',
+            'instrument': 'EUR_USD',
+            'bids': [{'price': '1.08000'}],
+            'asks': [{'price': '1.08010'}],
+        }
+        client._stream_stop.set()
+        yield {'type': 'HEARTBEAT'}
+
+    monkeypatch.setattr(client._stream_client, 'request', fake_request)
+    client._run_pricing_stream(['EUR_USD'])
+
+    assert len(calls) == 2
+    assert client._prices['EUR_USD']['bid'] == 1.08
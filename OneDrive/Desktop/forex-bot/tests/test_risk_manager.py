@@ -0,0 +1,72 @@
+"""
+Tests for RiskManager state persistence.
+"""
+import json
+from datetime import date, timedelta
+
+from src.risk_manager import RiskManager, RiskRejectReason
+
+CONFIG = {'risk_management': {'daily_loss_limit': 0.05, 'auto_disable_on_limit': True}}
+
+
+def test_auto_disable_survives_restart(tmp_path):
+    state_path = tmp_path / 'risk_state.json'
+    risk = RiskManager(CONFIG, state_path=str(state_path))
+    risk.record_trade_result(-600.0)
+
+    can_open, reason = risk.can_open_position(0, 10000.0, 0.0)
+    assert (can_open, reason) == (False, RiskRejectReason.DAILY)
+
+    restarted = RiskManager(CONFIG, state_path=str(state_path))
+    assert restarted.trading_enabled is False
+    assert restarted.daily_pnl == -600.0
+
+
+def test_state_is_not_persisted_without_a_path(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    risk = RiskManager(CONFIG)
+    risk.record_trade_result(-600.0)
+    risk.disable_trading()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def _write_state(path, day, trading_enabled):
+    path.write_text(json.dumps({
+        'daily_pnl': -250.0,
+        'weekly_pnl': -400.0,
+        'last_reset_day': day.isoformat(),
+        'last_reset_week': day.isocalendar().week,
+        'trading_enabled': trading_enabled,
+    }))
+
+
+def test_load_state_restores_same_day(tmp_path):
+    state_path = tmp_path / 'risk_state.json'
+    _write_state(state_path, date.today(), trading_enabled=False)
+
+    risk = RiskManager(CONFIG, state_path=str(state_path))
+    assert risk.daily_pnl == -250.0
+    assert risk.weekly_pnl == -400.0
+    assert risk.trading_enabled is False
+
+
+def test_load_state_resets_day_after_midnight(tmp_path):
+    state_path = tmp_path / 'risk_state.json'
+    yesterday = date.today() - timedelta(days=1)
+    _write_state(state_path, yesterday, trading_enabled=False)
+
+    risk = RiskManager(CONFIG, state_path=str(state_path))
+    assert risk.daily_pnl == 0.0
+    assert risk.trading_enabled is True
+    same_week = yesterday.isocalendar().week == date.today().isocalendar().week
+    assert risk.weekly_pnl == (-400.0 if same_week else 0.0)
+
+
+def test_load_state_drops_last_years_week(tmp_path):
+    state_path = tmp_path / 'risk_state.json'
+    # Same ISO week number, a year earlier
+    _write_state(state_path, date.today() - timedelta(weeks=52), trading_enabled=True)
+
+    risk = RiskManager(CONFIG, state_path=str(state_path))
+    assert risk.weekly_pnl == 0.0
@@ -0,0 +1,158 @@
+"""
+Tests for the TradingView webhook.
+"""
+import hmac
+import http.client
+import time
+
+import orjson
+import pytest
+
+from src.tradingview_webhook import MAC_ALGORITHMS, TradingSignal, TradingViewWebhook
+
+
+def test_null_strategy_defaults_to_unknown():
+    signal = TradingSignal.model_validate(
+        {'action': 'BUY', 'instrument': 'EUR/USD', 'strategy': None}
+    )
+    assert signal.strategy == 'unknown'
+
+
+def test_missing_strategy_defaults_to_unknown():
+    signal = TradingSignal.model_validate({'action': 'buy', 'instrument': 'EUR_USD'})
+    assert signal.strategy == 'unknown'
+
+
+def test_null_short_keys_fall_back_to_long_keys():
+    signal = TradingSignal.model_validate({
+        'action': 'sell',
+        'instrument': 'EUR_USD',
+        'sl': None,
+        'stop_loss': 1.08,
+        'tp': None,
+        'take_profit': 1.05,
+    })
+    assert signal.stop_loss == 1.08
+    assert signal.take_profit == 1.05
+
+
+def test_short_keys_take_precedence():
+    signal = TradingSignal.model_validate({
+        'action': 'buy',
+        'instrument': 'EUR_USD',
+        'sl': 1.07,
+        'stop_loss': 1.06,
+        'tp': 1.10,
+    })
+    assert signal.stop_loss == 1.07
+    assert signal.take_profit == 1.10
+    assert 'sl' not in signal.model_dump()
+
+
+def test_shutdown_closes_idle_keep_alive_connections():
+    webhook = TradingViewWebhook(port=0)
+    webhook.run_async()
+    deadline = time.monotonic() + 5
+    while webhook._server is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    conn = http.client.HTTPConnection('127.0.0.1', webhook._server.effective_port)
+    conn.request('GET', '/health')
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 200
+
+    webhook.shutdown(timeout=5)
+    assert not webhook._thread.is_alive()
+    conn.close()
+
+
+def test_run_async_refuses_while_thread_is_running():
+    webhook = TradingViewWebhook(port=0)
+    webhook.run_async()
+    try:
+        with pytest.raises(RuntimeError):
+            webhook.run_async()
+    finally:
+        webhook.shutdown(timeout=5)
+
+
+SECRET = 'test-secret'
+SIGNAL = {'action': 'buy', 'instrument': 'EUR_USD', 'timestamp': '1700000000'}
+
+
+def _client(**kwargs):
+    webhook = TradingViewWebhook(**kwargs)
+    webhook.register_signal_handler(lambda signal: {'handled': signal['instrument']})
+    return webhook.app.test_client()
+
+
+def _sign(payload: bytes, algorithm: str = 'sha256') -> str:
+    return hmac.new(SECRET.encode(), payload, digestmod=algorithm).hexdigest()
+
+
+@pytest.mark.parametrize('algorithm', MAC_ALGORITHMS)
+def test_header_signature_accepted(algorithm):
+    client = _client(webhook_secret=SECRET, mac_algorithm=algorithm)
+    body = orjson.dumps(SIGNAL)
+    response = client.post('/webhook', data=body, headers={'X-Signature': _sign(body, algorithm)})
+    assert response.status_code == 200
+    assert response.get_json()['result'] == {'handled': 'EUR_USD'}
+
+
+def test_header_signature_rejected():
+    client = _client(webhook_secret=SECRET)
+    body = orjson.dumps(SIGNAL)
+    forged = _sign(body + b' ')
+    response = client.post('/webhook', data=body, headers={'X-Signature': forged})
+    assert response.status_code == 401
+
+
+def test_header_signed_with_other_algorithm_rejected():
+    client = _client(webhook_secret=SECRET, mac_algorithm='blake2b')
+    body = orjson.dumps(SIGNAL)
+    response = client.post('/webhook', data=body, headers={'X-Signature': _sign(body, 'sha256')})
+    assert response.status_code == 401
+
+
+def test_legacy_body_signature_accepted():
+    client = _client(webhook_secret=SECRET)
+    payload = (SIGNAL['timestamp'] + SIGNAL['action']).encode()
+    response = client.post('/webhook', json={**SIGNAL, 'signature': _sign(payload)})
+    assert response.status_code == 200
+
+
+def test_legacy_body_signature_rejected():
+    client = _client(webhook_secret=SECRET)
+    assert client.post('/webhook', json={**SIGNAL, 'signature': 'ab' * 32}).status_code == 401
+    assert client.post('/webhook', json=SIGNAL).status_code == 401
+
+
+def test_unsigned_request_rejected_when_header_required():
+    client = _client(webhook_secret=SECRET, require_signature_header=True)
+    payload = (SIGNAL['timestamp'] + SIGNAL['action']).encode()
+    response = client.post('/webhook', json={**SIGNAL, 'signature': _sign(payload)})
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize('remote_addr, status', [
+    ('52.89.214.238', 200),   # exact address
+    ('10.1.2.3', 200),        # inside 10.0.0.0/8
+    ('192.168.0.1', 403),
+    ('2001:db8::1', 200),     # inside 2001:db8::/32
+    ('2001:db9::1', 403),
+])
+def test_ip_whitelist(remote_addr, status):
+    client = _client(allowed_ips=['52.89.214.238', '10.0.0.0/8', '2001:db8::/32'])
+    response = client.post('/webhook', json=SIGNAL, environ_base={'REMOTE_ADDR': remote_addr})
+    assert response.status_code == status
+
+
+def test_forwarded_for_header_does_not_bypass_whitelist():
+    client = _client(allowed_ips=['52.89.214.238'])
+    response = client.post(
+        '/webhook', json=SIGNAL,
+        headers={'X-Forwarded-For': '52.89.214.238'},
+        environ_base={'REMOTE_ADDR': '192.168.0.1'}
+    )
+    assert response.status_code == 403